@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import tomllib
+
+try:
+    import rtoml as _toml_fast
+except ImportError:
+    _toml_fast = None
+
+
+_LOCK = threading.Lock()
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache.json")
+
+
+def _read_sidecar(cache_path: Path, mtime_ns: int, size: int) -> dict | None:
+    try:
+        with cache_path.open("rb") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("mtime_ns") != mtime_ns or payload.get("size") != size:
+        return None
+    data = payload.get("data")
+    return data if isinstance(data, dict) else None
+
+
+def _json_exact(value: object) -> bool:
+    # TOML datetimes, dates and times have no JSON form; writing them through
+    # default=str would make a warm load return strings where a cold load
+    # returns datetime objects.
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, list):
+        return all(_json_exact(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _json_exact(v) for k, v in value.items())
+    return False
+
+
+def _write_sidecar(cache_path: Path, mtime_ns: int, size: int, data: dict) -> None:
+    # The sidecar holds the same secrets as the TOML, so keep it owner-only and
+    # swap it in atomically; a failed write just means the next run re-parses.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        payload = json.dumps(
+            {"mtime_ns": mtime_ns, "size": size, "data": data}
+        ).encode("utf-8")
+        fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=8)
+def _load_toml_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    path = Path(path_str)
+    cache_path = _cache_path(path)
+    data = _read_sidecar(cache_path, mtime_ns, size)
+    if data is not None:
+        return data
+    if _toml_fast is not None:
+        data = _toml_fast.load(path)
+    else:
+        with path.open("rb") as f:
+            data = tomllib.load(f)
+    if _json_exact(data):
+        _write_sidecar(cache_path, mtime_ns, size, data)
+    return data
+
+
+def load_toml(path: Path) -> dict:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    # Gradio handlers run on a worker pool; serialize so a cold cache is
+    # parsed (and the sidecar written) once. The cached dict is shared, so
+    # hand each caller its own copy.
+    with _LOCK:
+        return dict(_load_toml_cached(str(path), st.st_mtime_ns, st.st_size))
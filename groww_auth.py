@@ -1,18 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 from pathlib import Path
-import tomllib
+import time
 
-from growwapi import GrowwAPI
+from _secrets_cache import load_toml as _load_toml
 
 
-def _load_toml(path: Path) -> dict:
-    if not path.exists():
-        return {}
-    with path.open("rb") as f:
-        return tomllib.load(f)
+_MODULE_DIR = Path(__file__).resolve().parent
+_SECRETS_PATH = _MODULE_DIR / ".secrets.toml"
+_TOKEN_PATH = _MODULE_DIR / ".access_token"
+_ENV_KEYS = (
+    "GROWW_APPROVAL_API_KEY",
+    "GROWW_API_KEY",
+    "GROWW_APPROVAL_SECRET",
+    "GROWW_API_SECRET",
+    "GROWW_TOTP_TOKEN",
+    "GROWW_TOTP_SECRET",
+    "GROWW_TOTP",
+)
 
 
 def _redact(value: str, *, keep_start: int = 6, keep_end: int = 4) -> str:
@@ -46,12 +54,23 @@ def _normalize_access_token(value: object) -> str:
     return str(value).strip()
 
 
+@functools.lru_cache(maxsize=8)
+def _totp_obj(totp_secret: str):
+    import pyotp
+
+    return pyotp.TOTP(totp_secret)
+
+
+@functools.lru_cache(maxsize=8)
+def _totp_at_window(totp_secret: str, window: int) -> str:
+    return _totp_obj(totp_secret).at(window * 30)
+
+
 def _totp_now_from_secret(totp_secret: str) -> str:
     import binascii
-    import pyotp
 
     try:
-        return pyotp.TOTP(str(totp_secret)).now()
+        return _totp_at_window(str(totp_secret), int(time.time()) // 30)
     except (binascii.Error, ValueError) as e:
         raise ValueError(
             "Invalid `totp_secret`: it must be the Base32 TOTP secret from the QR setup. "
@@ -87,32 +106,37 @@ def main() -> int:
         action="store_true",
         help="Save the access token to .access_token (gitignored).",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Also construct a GrowwAPI client with the new token (skipped by default to avoid the client warmup).",
+    )
     args = parser.parse_args()
 
-    secrets_path = Path(__file__).resolve().parent / ".secrets.toml"
-    cfg = _load_toml(secrets_path)
+    cfg = _load_toml(_SECRETS_PATH)
+    env = {key: os.environ.get(key) for key in _ENV_KEYS}
 
-    legacy_api_key = _first(cfg.get("api_key"), os.environ.get("GROWW_API_KEY"))
-    legacy_secret = _first(cfg.get("secret"), os.environ.get("GROWW_API_SECRET"))
+    legacy_api_key = _first(cfg.get("api_key"), env["GROWW_API_KEY"])
+    legacy_secret = _first(cfg.get("secret"), env["GROWW_API_SECRET"])
 
     approval_api_key = _first(
         cfg.get("approval_api_key"),
         legacy_api_key,
-        os.environ.get("GROWW_APPROVAL_API_KEY"),
+        env["GROWW_APPROVAL_API_KEY"],
     )
     approval_secret = _first(
         cfg.get("approval_secret"),
         legacy_secret,
-        os.environ.get("GROWW_APPROVAL_SECRET"),
+        env["GROWW_APPROVAL_SECRET"],
     )
 
     totp_token = _first(
-        args.totp_token, cfg.get("totp_token"), os.environ.get("GROWW_TOTP_TOKEN")
+        args.totp_token, cfg.get("totp_token"), env["GROWW_TOTP_TOKEN"]
     )
-    totp_from_env = _first(os.environ.get("GROWW_TOTP"))
+    totp_from_env = _first(env["GROWW_TOTP"])
     totp_from_cfg = _first(cfg.get("totp"))
     totp = _first(args.totp, totp_from_env)
-    totp_secret = _first(cfg.get("totp_secret"), os.environ.get("GROWW_TOTP_SECRET"))
+    totp_secret = _first(cfg.get("totp_secret"), env["GROWW_TOTP_SECRET"])
 
     use_totp = args.flow == "totp" or (
         args.flow == "auto" and totp_token and (totp or totp_secret)
@@ -161,6 +185,8 @@ def main() -> int:
             )
 
         if use_totp:
+            from growwapi import GrowwAPI
+
             access_token_obj = GrowwAPI.get_access_token(api_key=totp_token, totp=totp)
         else:
             access_token_obj = None
@@ -174,6 +200,8 @@ def main() -> int:
             raise SystemExit(
                 "Missing approval_secret. Put it in .secrets.toml (recommended) or set GROWW_APPROVAL_SECRET."
             )
+        from growwapi import GrowwAPI
+
         access_token_obj = GrowwAPI.get_access_token(
             api_key=approval_api_key, secret=approval_secret
         )
@@ -185,12 +213,18 @@ def main() -> int:
             "Got an empty access token back from the API; double-check your credentials and approvals."
         )
 
-    _ = GrowwAPI(access_token)
+    if args.verify:
+        from growwapi import GrowwAPI
+
+        _ = GrowwAPI(access_token)
 
     if args.save_token:
-        (Path(__file__).resolve().parent / ".access_token").write_text(
-            str(access_token).strip() + "\n", encoding="utf-8"
-        )
+        data = (str(access_token).strip() + "\n").encode("utf-8")
+        fd = os.open(str(_TOKEN_PATH), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
     if args.print_token:
         print(access_token)
@@ -2,21 +2,29 @@ from __future__ import annotations
 
 import argparse
 import code
+import functools
 import inspect
 import json
 import os
 from getpass import getpass
 from pathlib import Path
-import tomllib
+import sys
+import time
 
-from growwapi import GrowwAPI
+from _secrets_cache import load_toml as _load_toml
 
 
-def _load_toml(path: Path) -> dict:
-    if not path.exists():
-        return {}
-    with path.open("rb") as f:
-        return tomllib.load(f)
+_MODULE_DIR = Path(__file__).resolve().parent
+_SECRETS_PATH = _MODULE_DIR / ".secrets.toml"
+_ENV_KEYS = (
+    "GROWW_APPROVAL_API_KEY",
+    "GROWW_API_KEY",
+    "GROWW_APPROVAL_SECRET",
+    "GROWW_API_SECRET",
+    "GROWW_TOTP_TOKEN",
+    "GROWW_TOTP_SECRET",
+    "GROWW_TOTP",
+)
 
 
 def _first(*values: object) -> str | None:
@@ -29,12 +37,23 @@ def _first(*values: object) -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=8)
+def _totp_obj(totp_secret: str):
+    import pyotp
+
+    return pyotp.TOTP(totp_secret)
+
+
+@functools.lru_cache(maxsize=8)
+def _totp_at_window(totp_secret: str, window: int) -> str:
+    return _totp_obj(totp_secret).at(window * 30)
+
+
 def _totp_now_from_secret(totp_secret: str) -> str:
     import binascii
-    import pyotp
 
     try:
-        return pyotp.TOTP(str(totp_secret)).now()
+        return _totp_at_window(str(totp_secret), int(time.time()) // 30)
     except (binascii.Error, ValueError) as e:
         raise SystemExit(
             "Invalid TOTP secret: it must be Base32 from the QR setup. "
@@ -42,28 +61,67 @@ def _totp_now_from_secret(totp_secret: str) -> str:
         ) from e
 
 
-def _print_response(value: object) -> None:
+def _print_response(value: object, *, compact: bool = False) -> None:
     try:
-        print(json.dumps(value, indent=2, ensure_ascii=True))
+        if compact:
+            text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(value, indent=2, ensure_ascii=True)
     except TypeError:
         print(value)
+        return
+    sys.stdout.write(text + "\n")
+
+
+def _fast_sig(fn) -> str:
+    # Cheaper than inspect.signature: read names and defaults straight off
+    # the code object. Annotations are left out of the listing. Decorated
+    # methods are unwrapped so the listing shows the real parameters.
+    fn = inspect.unwrap(fn)
+    co = fn.__code__
+    names = co.co_varnames
+    positional = names[: co.co_argcount]
+    kwonly = names[co.co_argcount : co.co_argcount + co.co_kwonlyargcount]
+    defaults = fn.__defaults__ or ()
+    kwdefaults = fn.__kwdefaults__ or {}
+
+    split = len(positional) - len(defaults)
+    parts = list(positional[:split])
+    parts.extend(f"{n}={d!r}" for n, d in zip(positional[split:], defaults))
+
+    extra = co.co_argcount + co.co_kwonlyargcount
+    if co.co_flags & inspect.CO_VARARGS:
+        parts.append(f"*{names[extra]}")
+        extra += 1
+    elif kwonly:
+        parts.append("*")
+    parts.extend(f"{n}={kwdefaults[n]!r}" if n in kwdefaults else n for n in kwonly)
+    if co.co_flags & inspect.CO_VARKEYWORDS:
+        parts.append(f"**{names[extra]}")
+    return "(" + ", ".join(parts) + ")"
+
+
+@functools.cache
+def _method_line(name: str, fn) -> str:
+    sig = _fast_sig(fn)
+    doc = inspect.getdoc(fn) or ""
+    doc_line = doc.splitlines()[0] if doc else ""
+    if doc_line:
+        return f"{name}{sig} - {doc_line}"
+    return f"{name}{sig}"
 
 
 def _list_api_methods() -> None:
-    methods = []
-    for name, fn in inspect.getmembers(GrowwAPI, predicate=inspect.isfunction):
+    from growwapi import GrowwAPI
+
+    lines = []
+    for name, attr in sorted(vars(GrowwAPI).items()):
         if name.startswith("_"):
             continue
-        sig = str(inspect.signature(fn))
-        doc = inspect.getdoc(fn) or ""
-        doc_line = doc.splitlines()[0] if doc else ""
-        methods.append((name, sig, doc_line))
-
-    for name, sig, doc_line in sorted(methods):
-        if doc_line:
-            print(f"{name}{sig} - {doc_line}")
-        else:
-            print(f"{name}{sig}")
+        fn = attr.__func__ if isinstance(attr, (staticmethod, classmethod)) else attr
+        if inspect.isfunction(fn):
+            lines.append(_method_line(name, fn))
+    print("\n".join(lines))
 
 
 def _parse_json(value: str | None, *, default: object) -> object:
@@ -90,33 +148,28 @@ def _confirm_if_trading(method_name: str) -> None:
             raise SystemExit("Aborted.")
 
 
-def _extract_holdings(value: object) -> list[dict]:
+def _holding_haystack(item: dict) -> str:
+    # Same text the old json.dumps fallback searched (keys and nested values
+    # included), built once per holding instead of once per query.
+    return json.dumps(item, ensure_ascii=False, default=str).lower()
+
+
+def _extract_holdings(value: object) -> list[tuple[dict, str]]:
+    items: list = []
     if isinstance(value, list):
-        return [v for v in value if isinstance(v, dict)]
-    if isinstance(value, dict):
+        items = value
+    elif isinstance(value, dict):
         for key in ("holdings", "data", "items"):
-            items = value.get(key)
-            if isinstance(items, list):
-                return [v for v in items if isinstance(v, dict)]
-    return []
-
-
-def _holding_matches(item: dict, query: str) -> bool:
-    q = query.lower()
-    for key in (
-        "tradingSymbol",
-        "trading_symbol",
-        "symbol",
-        "companyName",
-        "company_name",
-        "isin",
-        "instrumentToken",
-        "instrument_token",
-    ):
-        value = item.get(key)
-        if value and q in str(value).lower():
-            return True
-    return q in json.dumps(item, default=str).lower()
+            candidate = value.get(key)
+            if isinstance(candidate, list):
+                items = candidate
+                break
+    return [(v, _holding_haystack(v)) for v in items if isinstance(v, dict)]
+
+
+def _holding_matches(entry: tuple[dict, str], q: str) -> bool:
+    # `q` must already be lowercased by the caller.
+    return q in entry[1]
 
 
 def _holding_symbol_candidates(items: list[dict]) -> list[str]:
@@ -130,6 +183,53 @@ def _holding_symbol_candidates(items: list[dict]) -> list[str]:
     return sorted(set(symbols))
 
 
+_SEARCH_COLS = (
+    "trading_symbol",
+    "groww_symbol",
+    "name",
+    "isin",
+    "exchange_token",
+    "underlying_symbol",
+)
+_SEARCH_INDEX: dict[int, tuple] = {}
+
+
+def _search_index(df):
+    # One lowercased haystack per row plus upper-cased filter columns, built
+    # once per instruments frame. The frame is kept in the entry so its id()
+    # cannot be recycled while cached.
+    cached = _SEARCH_INDEX.get(id(df))
+    if cached is not None and cached[0] is df:
+        return cached[1:]
+
+    cols = [c for c in _SEARCH_COLS if c in df.columns]
+    text = None
+    for col in cols:
+        part = df[col].fillna("").astype(str)
+        # \x1f never appears in a query, so matches cannot span two columns.
+        text = part if text is None else text + "\x1f" + part
+    if text is not None:
+        text = text.str.lower()
+    exchange = segment = None
+    if "exchange" in df.columns:
+        exchange = df["exchange"].astype(str).str.upper().to_numpy()
+    if "segment" in df.columns:
+        segment = df["segment"].astype(str).str.upper().to_numpy()
+
+    _SEARCH_INDEX.clear()
+    _SEARCH_INDEX[id(df)] = (df, text, exchange, segment)
+    return text, exchange, segment
+
+
+def _filter_mask(col, value: str, size: int):
+    import numpy as np
+
+    # A frame without the filter column matches nothing for that filter.
+    if col is None:
+        return np.zeros(size, dtype=bool)
+    return col == value.upper()
+
+
 def _search_instruments(
     df,
     query: str,
@@ -142,48 +242,53 @@ def _search_instruments(
     if not q:
         return df.head(0)
 
-    filtered = df
+    text, exchange_col, segment_col = _search_index(df)
+    if text is None:
+        return df.head(0)
+
+    import numpy as np
+
+    keep = None
     if exchange:
-        filtered = filtered[filtered["exchange"].str.upper() == exchange.upper()]
+        keep = _filter_mask(exchange_col, exchange, len(df))
     if segment:
-        filtered = filtered[filtered["segment"].str.upper() == segment.upper()]
-
-    cols = [
-        "trading_symbol",
-        "groww_symbol",
-        "name",
-        "isin",
-        "exchange_token",
-        "underlying_symbol",
-    ]
-    mask = None
-    for col in cols:
-        if col in filtered.columns:
-            series = filtered[col].astype(str).str.lower()
-            m = series.str.contains(q, na=False)
-            mask = m if mask is None else (mask | m)
-    if mask is None:
-        return filtered.head(0)
+        m = _filter_mask(segment_col, segment, len(df))
+        keep = m if keep is None else np.logical_and(keep, m, out=keep)
+
+    # Filter by position and slice the frame once, instead of materializing
+    # an intermediate DataFrame per filter.
+    if keep is None:
+        rows = np.arange(len(df))
+    else:
+        rows = np.flatnonzero(keep)
+        text = text.iloc[rows]
+    hits = rows[text.str.contains(q, regex=False).to_numpy(dtype=bool)]
+    return df.iloc[hits[:limit]]
+
 
-    return filtered[mask].head(limit)
+_INSTRUMENT_ROW_COLS = (
+    "exchange",
+    "segment",
+    "trading_symbol",
+    "groww_symbol",
+    "name",
+    "isin",
+    "exchange_token",
+    "instrument_type",
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _instrument_row_cols(columns: tuple) -> list[str]:
+    return [c for c in _INSTRUMENT_ROW_COLS if c in columns]
 
 
 def _print_instrument_rows(df) -> None:
     if df is None or len(df) == 0:
         print("No instruments found.")
         return
-    cols = [
-        "exchange",
-        "segment",
-        "trading_symbol",
-        "groww_symbol",
-        "name",
-        "isin",
-        "exchange_token",
-        "instrument_type",
-    ]
-    cols = [c for c in cols if c in df.columns]
-    print(df[cols].to_string(index=False))
+    cols = _instrument_row_cols(tuple(df.columns))
+    sys.stdout.write(df[cols].to_string(index=False) + "\n")
 
 
 def _choose_flow(available_approval: bool, available_totp: bool) -> str:
@@ -201,30 +306,33 @@ def _choose_flow(available_approval: bool, available_totp: bool) -> str:
 
 
 def _get_access_token(args: argparse.Namespace) -> str:
-    cfg = _load_toml(Path(__file__).resolve().parent / ".secrets.toml")
+    from growwapi import GrowwAPI
+
+    cfg = _load_toml(_SECRETS_PATH)
+    env = {key: os.environ.get(key) for key in _ENV_KEYS}
 
     approval_api_key = _first(
         args.approval_api_key,
         cfg.get("approval_api_key"),
         cfg.get("api_key"),
-        os.environ.get("GROWW_APPROVAL_API_KEY"),
-        os.environ.get("GROWW_API_KEY"),
+        env["GROWW_APPROVAL_API_KEY"],
+        env["GROWW_API_KEY"],
     )
     approval_secret = _first(
         args.approval_secret,
         cfg.get("approval_secret"),
         cfg.get("secret"),
-        os.environ.get("GROWW_APPROVAL_SECRET"),
-        os.environ.get("GROWW_API_SECRET"),
+        env["GROWW_APPROVAL_SECRET"],
+        env["GROWW_API_SECRET"],
     )
 
     totp_token = _first(
         args.totp_token,
         cfg.get("totp_token"),
-        os.environ.get("GROWW_TOTP_TOKEN"),
+        env["GROWW_TOTP_TOKEN"],
     )
-    totp_secret = _first(cfg.get("totp_secret"), os.environ.get("GROWW_TOTP_SECRET"))
-    totp = _first(args.totp, os.environ.get("GROWW_TOTP"))
+    totp_secret = _first(cfg.get("totp_secret"), env["GROWW_TOTP_SECRET"])
+    totp = _first(args.totp, env["GROWW_TOTP"])
 
     available_approval = bool(approval_api_key and approval_secret)
     available_totp = bool(totp_token and (totp or totp_secret))
@@ -251,7 +359,7 @@ def _get_access_token(args: argparse.Namespace) -> str:
     return GrowwAPI.get_access_token(api_key=totp_token, totp=totp)
 
 
-def main() -> int:
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Interactive CLI for GrowwAPI auth + safe data fetch."
     )
@@ -299,17 +407,47 @@ def main() -> int:
         default=25,
         help="Max rows for instrument search (default: 25).",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Print JSON responses on one line without indentation (faster for large responses).",
+    )
+    return parser
+
+
+_NO_VALUE_FLAGS = frozenset({"--list-methods", "--repl", "--compact"})
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    # --list-methods needs no auth or other flags; skip building the parser,
+    # but only when every token is a flag that takes no value. Anything else
+    # goes through argparse so unknown flags and option values are handled.
+    if "--list-methods" in argv and set(argv) <= _NO_VALUE_FLAGS:
+        _list_api_methods()
+        return 0
+
+    args = _build_parser().parse_args(argv)
 
     if args.list_methods:
         _list_api_methods()
         return 0
 
+    from growwapi import GrowwAPI
+
     access_token = _get_access_token(args)
     groww = GrowwAPI(access_token)
 
+    instruments = None
+
+    def _instruments_df():
+        nonlocal instruments
+        if instruments is None:
+            instruments = groww.get_all_instruments()
+        return instruments
+
     if args.instrument_search:
-        df = groww.get_all_instruments()
+        df = _instruments_df()
         result = _search_instruments(
             df,
             args.instrument_search,
@@ -346,7 +484,7 @@ def main() -> int:
             raise SystemExit("--kwargs must be a JSON object")
 
         result = method(*call_args, **call_kwargs)
-        _print_response(result)
+        _print_response(result, compact=args.compact)
         return 0
 
     menu = (
@@ -368,12 +506,15 @@ def main() -> int:
         if choice in {"q", "quit", "exit"}:
             return 0
         if choice == "1":
-            _print_response(groww.get_user_profile(timeout=10))
+            _print_response(groww.get_user_profile(timeout=10), compact=args.compact)
         elif choice == "2":
-            _print_response(groww.get_holdings_for_user(timeout=10))
+            _print_response(groww.get_holdings_for_user(timeout=10), compact=args.compact)
         elif choice == "3":
             segment = input("segment (blank for all): ").strip().upper() or None
-            _print_response(groww.get_positions_for_user(segment=segment, timeout=10))
+            _print_response(
+                groww.get_positions_for_user(segment=segment, timeout=10),
+                compact=args.compact,
+            )
         elif choice == "4":
             symbol = input("trading_symbol (e.g. WIPRO): ").strip().upper()
             exchange = input("exchange [NSE/BSE] (default NSE): ").strip().upper() or "NSE"
@@ -384,7 +525,8 @@ def main() -> int:
                     exchange=exchange,
                     segment=segment,
                     timeout=10,
-                )
+                ),
+                compact=args.compact,
             )
         elif choice == "5":
             raw = input("symbols comma-separated (e.g. WIPRO,RELIANCE): ").strip()
@@ -396,14 +538,21 @@ def main() -> int:
                     symbols.append(s)
                 else:
                     symbols.append(f"{exchange}_{s}")
-            _print_response(groww.get_ltp(tuple(symbols), segment, timeout=10))
+            _print_response(
+                groww.get_ltp(tuple(symbols), segment, timeout=10),
+                compact=args.compact,
+            )
         elif choice == "6":
             query = input("holding symbol / ISIN / name (partial ok): ").strip()
             holdings = groww.get_holdings_for_user(timeout=10)
             items = _extract_holdings(holdings)
-            matches = [item for item in items if _holding_matches(item, query)]
+            q = query.lower()
+            matches = [entry[0] for entry in items if _holding_matches(entry, q)]
             if matches:
-                _print_response(matches if len(matches) > 1 else matches[0])
+                _print_response(
+                    matches if len(matches) > 1 else matches[0],
+                    compact=args.compact,
+                )
             else:
                 print("No match found.")
                 print("Note: holdings only include stocks you own. Use get_quote/get_ltp for other symbols.")
@@ -415,7 +564,7 @@ def main() -> int:
             segment = input("segment filter (blank for any): ").strip().upper() or None
             limit_raw = input("max results (default 25): ").strip()
             limit = int(limit_raw) if limit_raw.isdigit() else 25
-            df = groww.get_all_instruments()
+            df = _instruments_df()
             result = _search_instruments(
                 df, query, exchange=exchange, segment=segment, limit=limit
             )
@@ -1,32 +1,80 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import datetime as dt
+import functools
 import inspect
 import json
+import logging
 import os
+import re
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-import tomllib
+import threading
+import time
 
 import gradio as gr
+import numpy as np
+# Gradio depends on orjson and already uses it for gr.JSON output.
+import orjson
+import pandas as pd
+from dateutil.tz import tzlocal
 from growwapi import GrowwAPI, GrowwFeed
+from growwapi.groww.exceptions import GrowwAPITimeoutException
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
+from _secrets_cache import load_toml as _load_toml
+
+
+_SECRETS_PATH = Path(__file__).resolve().parent / ".secrets.toml"
+_LOG = logging.getLogger(__name__)
+
 INSTRUMENT_CACHE = {"df": None}
-FEED_CACHE: dict[str, GrowwFeed] = {}
+_INSTRUMENT_LOCK = threading.Lock()
+FEED_CACHE_MAX = 16
+FEED_CACHE: OrderedDict[str, GrowwFeed] = OrderedDict()
+_FEED_LOCK = threading.RLock()
+
+SUBSCRIBE_BATCH_DELAY = 0.05
+SUBSCRIBE_TIMEOUT = 30.0
+# Gradio runs the sync handlers on a thread pool; give the HTTP pool one
+# keep-alive connection per worker so none are opened and thrown away.
+WORKER_THREADS = 40
+_PENDING_SUBS: dict[tuple[str, str], tuple[list[dict], list[Future]]] = {}
+_SUBS_LOCK = threading.Lock()
+API_CACHE_TTL = 5.0
+PROFILE_CACHE_TTL = 300.0
+HOLDINGS_CACHE_TTL = 15.0
+EXPIRY_CACHE_TTL = 3600.0
+ORDER_LIST_MAX_PAGES = 50
+FEED_STREAM_INTERVAL = 0.5
+FEED_STREAM_MAX_SECONDS = 600
+API_CACHE_MAX = 256
+_API_CACHE: dict[tuple, tuple[float, object]] = {}
+_API_CACHE_LOCK = threading.Lock()
+_IN_FLIGHT: dict[tuple, Future] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
 
 
 def _load_cfg() -> dict:
-    path = Path(__file__).resolve().parent / ".secrets.toml"
-    if not path.exists():
-        return {}
-    return tomllib.loads(path.read_text(encoding="utf-8"))
+    return _load_toml(_SECRETS_PATH)
 
 
 def _first(*values: object) -> str | None:
     for value in values:
         if value is None:
             continue
-        value = str(value).strip()
+        if type(value) is str:
+            # TOML/textbox values rarely carry padding; only strip when needed.
+            if value and (value[0].isspace() or value[-1].isspace()):
+                value = value.strip()
+        else:
+            value = str(value).strip()
         if value:
             return value
     return None
@@ -47,17 +95,25 @@ def _normalize_token(value: object) -> str:
     return str(value).strip()
 
 
+# orjson turns integers wider than 64 bits into floats and rejects the
+# NaN/Infinity literals json accepts, so such input goes through json.
+_LONG_DIGITS = re.compile(r"\d{20}")
+
+
 def _parse_json(value: str) -> object:
     if not value.strip():
         return None
     try:
+        if _LONG_DIGITS.search(value) is None:
+            with contextlib.suppress(orjson.JSONDecodeError):
+                return orjson.loads(value)
         return json.loads(value)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON: {e.msg} at pos {e.pos}") from e
 
 
-def _require_no_trading(method_name: str, allow_trading: bool) -> None:
-    trading_methods = {
+_TRADING_METHODS = frozenset(
+    {
         "place_order",
         "modify_order",
         "cancel_order",
@@ -65,15 +121,34 @@ def _require_no_trading(method_name: str, allow_trading: bool) -> None:
         "modify_smart_order",
         "cancel_smart_order",
     }
-    if method_name in trading_methods and not allow_trading:
+)
+
+
+# Cached handlers whose results a successful trading call makes stale.
+_TRADE_STALE_HANDLERS = frozenset({"get_holdings", "get_order_list"})
+
+
+def _require_no_trading(method_name: str, allow_trading: bool) -> None:
+    if method_name in _TRADING_METHODS and not allow_trading:
         raise ValueError("Trading action blocked. Enable 'Allow trading actions' to proceed.")
 
+@functools.lru_cache(maxsize=4)
+def _totp_obj(totp_secret: str):
+    import pyotp
+
+    return pyotp.TOTP(totp_secret)
+
+
+@functools.lru_cache(maxsize=4)
+def _totp_at_window(totp_secret: str, window: int) -> str:
+    return _totp_obj(totp_secret).at(window * 30)
+
+
 def _totp_now_from_secret(totp_secret: str) -> str:
     import binascii
-    import pyotp
 
     try:
-        return pyotp.TOTP(str(totp_secret)).now()
+        return _totp_at_window(str(totp_secret), int(time.time()) // 30)
     except (binascii.Error, ValueError) as e:
         raise ValueError(
             "Invalid TOTP secret: it must be Base32 from the QR setup. "
@@ -81,29 +156,50 @@ def _totp_now_from_secret(totp_secret: str) -> str:
         ) from e
 
 
+def _norm_symbol(value: str) -> str:
+    return value.strip().upper()
+
+
+_HAS_EXCHANGE_SEP = re.compile(r"[:_]").search
+
+
 def _format_exchange_symbols(symbols: str, exchange: str) -> tuple[str, ...]:
-    items = []
-    for raw in symbols.split(","):
-        sym = raw.strip().upper()
-        if not sym:
-            continue
-        if ":" in sym or "_" in sym:
-            items.append(sym)
-        else:
-            items.append(f"{exchange}_{sym}")
-    return tuple(items)
+    return tuple(
+        sym if _HAS_EXCHANGE_SEP(sym) else f"{exchange}_{sym}"
+        for raw in symbols.upper().split(",")
+        if (sym := raw.strip())
+    )
 
 
 def _prune_nulls(value: object) -> object:
+    # Copy-on-write: containers without a None anywhere below them are
+    # returned as-is, so mostly non-null payloads are not rebuilt.
     if isinstance(value, dict):
-        cleaned: dict = {}
+        cleaned: dict | None = None
         for key, item in value.items():
-            if item is None:
-                continue
-            cleaned[key] = _prune_nulls(item)
-        return cleaned
+            pruned = None if item is None else _prune_nulls(item)
+            if cleaned is None:
+                if item is not None and pruned is item:
+                    continue
+                cleaned = {}
+                for prev_key, prev_item in value.items():
+                    if prev_key == key:
+                        break
+                    cleaned[prev_key] = prev_item
+            if item is not None:
+                cleaned[key] = pruned
+        return value if cleaned is None else cleaned
     if isinstance(value, list):
-        return [_prune_nulls(item) for item in value if item is not None]
+        cleaned_list: list | None = None
+        for index, item in enumerate(value):
+            pruned = None if item is None else _prune_nulls(item)
+            if cleaned_list is None:
+                if item is not None and pruned is item:
+                    continue
+                cleaned_list = value[:index]
+            if item is not None:
+                cleaned_list.append(pruned)
+        return value if cleaned_list is None else cleaned_list
     return value
 
 def _now_str() -> str:
@@ -121,14 +217,330 @@ def _relative_range(amount: int, unit: str) -> tuple[str, str]:
     return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _http_session() -> requests.Session:
+    session = requests.Session()
+    # Only GETs are retried: urllib3's defaults include PUT, which would replay
+    # order modifications. Read timeouts are not retried either, so a slow GET
+    # still fails after one timeout instead of three.
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=WORKER_THREADS,
+        max_retries=Retry(
+            total=2, read=0, backoff_factor=0.2, allowed_methods=frozenset({"GET"})
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_HTTP_SESSION = _http_session()
+
+
+class _PooledGrowwAPI(GrowwAPI):
+    # GrowwAPI issues every REST call through these helpers with module-level
+    # requests.get/post/put; route them through one keep-alive session.
+    def _request_get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        try:
+            return _HTTP_SESSION.get(
+                url, params=params, headers=headers, timeout=timeout, **kwargs
+            )
+        except requests.Timeout as e:
+            raise GrowwAPITimeoutException() from e
+
+    def _request_post(self, url, json=None, headers=None, timeout=None, **kwargs):
+        try:
+            return _HTTP_SESSION.post(
+                url=url, json=json, headers=headers, timeout=timeout, **kwargs
+            )
+        except requests.Timeout as e:
+            raise GrowwAPITimeoutException() from e
+
+    def _request_put(self, url, json=None, headers=None, timeout=None, **kwargs):
+        try:
+            return _HTTP_SESSION.put(
+                url=url, json=json, headers=headers, timeout=timeout, **kwargs
+            )
+        except requests.Timeout as e:
+            raise GrowwAPITimeoutException() from e
+
+
+@functools.lru_cache(maxsize=FEED_CACHE_MAX)
+def _new_client(token: str) -> GrowwAPI:
+    # GrowwAPI() makes an HTTP call on construction and caches the instrument
+    # master per instance, so reuse one client per token. This is kept here
+    # rather than in gr.State, which deep-copies its value per session.
+    return _PooledGrowwAPI(token)
+
+
 def _get_client(token: str) -> GrowwAPI:
-    return GrowwAPI(token)
+    # The LRU above and FEED_CACHE age independently, so prefer the client a
+    # live feed was built on (GrowwFeed.groww_api); otherwise an evicted
+    # client would be rebuilt as a second instance next to the feed's.
+    client = getattr(FEED_CACHE.get(token), "groww_api", None)
+    if client is not None:
+        return client
+    return _new_client(token)
+
+
+FEED_CLOSE_TIMEOUT = 5.0
+
+
+def _close_feed(feed: GrowwFeed) -> None:
+    for name in ("close", "disconnect"):
+        closer = getattr(feed, name, None)
+        if callable(closer):
+            try:
+                closer()
+            except Exception:
+                _LOG.warning("Closing an evicted feed failed", exc_info=True)
+            return
+    # growwapi 1.5 has no close(): every GrowwFeed registers its own NATS
+    # client on the class, which keeps the socket and its loop thread alive
+    # after we drop the feed. This relies on SDK internals, so only tear down
+    # when all of them are present; otherwise leave the feed alone.
+    clients = getattr(GrowwFeed, "_nats_clients", None)
+    key = getattr(feed, "_client_key", None)
+    client = clients.get(key) if isinstance(clients, dict) else None
+    socket = getattr(client, "_socket", None)
+    loop = getattr(client, "_loop", None)
+    thread = getattr(client, "consume_thread", None)
+    if socket is None or loop is None or not isinstance(thread, threading.Thread):
+        _LOG.warning("Unknown growwapi feed internals; evicted feed left open")
+        return
+    clients.pop(key, None)
+    # Runs off-thread: eviction happens under _FEED_LOCK.
+    threading.Thread(
+        target=_shutdown_nats, args=(socket, loop, thread), daemon=True
+    ).start()
+
+
+def _shutdown_nats(socket, loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    try:
+        asyncio.run_coroutine_threadsafe(socket.close(), loop).result(
+            timeout=FEED_CLOSE_TIMEOUT
+        )
+    except Exception:
+        _LOG.warning("Closing an evicted feed socket failed", exc_info=True)
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=FEED_CLOSE_TIMEOUT)
+    if thread.is_alive():
+        _LOG.warning("Feed loop thread did not stop; its event loop is left open")
+    elif not loop.is_closed():
+        loop.close()
 
 
 def _get_feed(token: str) -> GrowwFeed:
-    if token not in FEED_CACHE:
-        FEED_CACHE[token] = GrowwFeed(_get_client(token))
-    return FEED_CACHE[token]
+    # LRU over tokens: each feed holds a live socket, so evict (and close)
+    # the least recently used one once FEED_CACHE_MAX is exceeded.
+    feed = FEED_CACHE.get(token)
+    if feed is not None:
+        try:
+            FEED_CACHE.move_to_end(token)
+        except KeyError:
+            pass  # evicted concurrently; the caller still gets a usable feed
+        return feed
+    with _FEED_LOCK:
+        # Re-check under the lock so two first requests for the same token
+        # cannot open two sockets.
+        feed = FEED_CACHE.get(token)
+        if feed is not None:
+            return feed
+        feed = GrowwFeed(_get_client(token))
+        FEED_CACHE[token] = feed
+        while len(FEED_CACHE) > FEED_CACHE_MAX:
+            _, stale = FEED_CACHE.popitem(last=False)
+            _close_feed(stale)
+        return feed
+
+
+_FEED_INSTRUMENT_KEYS = ("exchange", "segment", "exchange_token")
+
+
+def _flush_subscriptions(key: tuple[str, str]) -> None:
+    with _SUBS_LOCK:
+        instrument_list, waiters = _PENDING_SUBS.pop(key)
+    token, kind = key
+    try:
+        subscribe = getattr(_get_feed(token), kind)
+        result = subscribe(instrument_list)
+    except Exception as e:
+        if len(waiters) == 1:
+            waiters[0].set_exception(e)
+            return
+        # One bad instrument must not fail everyone else in the window;
+        # retry individually so each error reaches only its owner.
+        for instrument, waiter in zip(instrument_list, waiters):
+            try:
+                single = subscribe([instrument])
+            except Exception as single_error:
+                waiter.set_exception(single_error)
+            else:
+                waiter.set_result(_own_subscribe_result(single, instrument))
+        return
+    for instrument, waiter in zip(instrument_list, waiters):
+        waiter.set_result(_own_subscribe_result(result, instrument))
+
+
+def _own_subscribe_result(result, instrument: dict) -> dict:
+    # The feed answers {exchange: {segment: {exchange_token: status}}} for
+    # the whole batch; each caller only sees its own instrument's entry.
+    exchange, segment, exchange_token = (instrument[k] for k in _FEED_INSTRUMENT_KEYS)
+    try:
+        status = result[exchange][segment][exchange_token]
+    except (KeyError, TypeError):
+        status = None
+    return {exchange: {segment: {exchange_token: status}}}
+
+
+def _subscription_result(waiter: Future):
+    # Don't pin a Gradio worker if the flush hangs inside the feed.
+    try:
+        return waiter.result(timeout=SUBSCRIBE_TIMEOUT)
+    except TimeoutError:
+        raise TimeoutError(
+            f"Feed subscribe did not finish within {SUBSCRIBE_TIMEOUT:g}s"
+        ) from None
+
+
+def _flush_subscription_keys(keys: list[tuple[str, str]]) -> None:
+    for key in keys:
+        _flush_subscriptions(key)
+
+
+def _queue_subscriptions(token: str, items: list[tuple[str, dict]]) -> list[Future]:
+    # Subscriptions for the same token/kind that arrive within
+    # SUBSCRIBE_BATCH_DELAY are sent as one feed call; each caller gets
+    # its own instrument's result. Kinds queued together share one timer, so their
+    # feed calls are flushed back to back.
+    waiters = []
+    new_keys = []
+    with _SUBS_LOCK:
+        for kind, instrument in items:
+            waiter: Future = Future()
+            waiters.append(waiter)
+            missing = [name for name in _FEED_INSTRUMENT_KEYS if not instrument.get(name)]
+            if missing:
+                waiter.set_exception(
+                    ValueError(f"Instrument is missing: {', '.join(missing)}")
+                )
+                continue
+            key = (token, kind)
+            pending = _PENDING_SUBS.get(key)
+            if pending is None:
+                pending = _PENDING_SUBS[key] = ([], [])
+                new_keys.append(key)
+            pending[0].append(instrument)
+            pending[1].append(waiter)
+        if new_keys:
+            timer = threading.Timer(
+                SUBSCRIBE_BATCH_DELAY, _flush_subscription_keys, args=(new_keys,)
+            )
+            timer.daemon = True
+            timer.start()
+    return waiters
+
+
+def _queue_subscription(token: str, kind: str, instrument: dict) -> Future:
+    return _queue_subscriptions(token, [(kind, instrument)])[0]
+
+
+def _token_guard(fn):
+    # Shared "Not connected" check and error-dict wrapping for handlers that
+    # take the raw token (feed handlers need it to key the feed cache).
+    @functools.wraps(fn)
+    def wrapper(token: str, *args):
+        if not token:
+            return {"error": "Not connected"}
+        try:
+            return fn(token, *args)
+        except Exception as e:
+            return {"error": str(e)}
+
+    return wrapper
+
+
+def _shared_call(key: tuple, call):
+    # Callers that arrive while a call with the same key is running wait for
+    # it and share its result instead of issuing their own.
+    with _IN_FLIGHT_LOCK:
+        waiter = _IN_FLIGHT.get(key)
+        leader = waiter is None
+        if leader:
+            waiter = _IN_FLIGHT[key] = Future()
+    if not leader:
+        return waiter.result()
+    try:
+        result = call()
+    except BaseException as e:
+        waiter.set_exception(e)
+        raise
+    else:
+        waiter.set_result(result)
+        return result
+    finally:
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT.pop(key, None)
+
+
+def _single_flight(fn):
+    # e.g. several tabs polling the same feed get one SDK read between them.
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        return _shared_call((name, args), functools.partial(fn, *args))
+
+    return wrapper
+
+
+def _api(fn=None, *, ttl: float | None = None, shared: bool = False):
+    # Like _token_guard, but hands the handler the cached GrowwAPI client.
+    # With ttl, successful results are reused for identical arguments until
+    # they expire (error dicts are never cached). With ttl or shared,
+    # concurrent identical calls share one request.
+    if fn is None:
+        return functools.partial(_api, ttl=ttl, shared=shared)
+
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(token: str, *args):
+        if not token:
+            return {"error": "Not connected"}
+        key = (name, token, args)
+        if ttl is not None:
+            hit = _API_CACHE.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+        try:
+            if ttl is None and not shared:
+                return fn(_get_client(token), *args)
+            result = _shared_call(key, lambda: fn(_get_client(token), *args))
+        except Exception as e:
+            return {"error": str(e)}
+        if ttl is not None and not (isinstance(result, dict) and "error" in result):
+            _cache_api_result(key, result, ttl)
+        return result
+
+    return wrapper
+
+
+def _cache_api_result(key: tuple, result: object, ttl: float) -> None:
+    now = time.monotonic()
+    with _API_CACHE_LOCK:
+        if len(_API_CACHE) >= API_CACHE_MAX:
+            for stale in [k for k, (expires, _) in _API_CACHE.items() if expires <= now]:
+                del _API_CACHE[stale]
+            while len(_API_CACHE) >= API_CACHE_MAX:
+                del _API_CACHE[next(iter(_API_CACHE))]
+        _API_CACHE[key] = (now + ttl, result)
+
+
+def _invalidate_api_cache(token: str, names: frozenset[str]) -> None:
+    with _API_CACHE_LOCK:
+        for key in [k for k in _API_CACHE if k[0] in names and k[1] == token]:
+            del _API_CACHE[key]
 
 
 def _lookup_instrument(
@@ -140,8 +552,29 @@ def _lookup_instrument(
     if exchange_token:
         return {"exchange_token": exchange_token, "exchange": exchange}
     return groww.get_instrument_by_exchange_and_trading_symbol(
-        exchange=exchange, trading_symbol=trading_symbol.strip().upper()
+        exchange=exchange, trading_symbol=_norm_symbol(trading_symbol)
+    )
+
+_NO_DEFAULTS = (None, None, None, None, None)
+_CONNECT_DEFAULTS = {"entry": (None, _NO_DEFAULTS)}
+
+
+def _connect_defaults(cfg: dict) -> tuple[str | None, ...]:
+    # _load_cfg hands back the same dict until .secrets.toml changes, so the
+    # fallback chain is resolved once per config rather than on every click.
+    cached_cfg, values = _CONNECT_DEFAULTS["entry"]
+    if cfg is cached_cfg:
+        return values
+    values = (
+        _first(cfg.get("approval_api_key"), cfg.get("api_key")),
+        _first(cfg.get("approval_secret"), cfg.get("secret")),
+        _first(cfg.get("totp_token")),
+        _first(cfg.get("totp_secret")),
+        _first(cfg.get("totp")),
     )
+    _CONNECT_DEFAULTS["entry"] = (cfg, values)
+    return values
+
 
 def connect(
     flow: str,
@@ -152,17 +585,13 @@ def connect(
     totp_secret: str,
     totp: str,
 ):
-    cfg = _load_cfg() if use_secrets else {}
+    defaults = _connect_defaults(_load_cfg()) if use_secrets else _NO_DEFAULTS
 
-    approval_api_key = _first(
-        approval_api_key, cfg.get("approval_api_key"), cfg.get("api_key")
-    )
-    approval_secret = _first(
-        approval_secret, cfg.get("approval_secret"), cfg.get("secret")
-    )
-    totp_token = _first(totp_token, cfg.get("totp_token"))
-    totp_secret = _first(totp_secret, cfg.get("totp_secret"))
-    totp = _first(totp, cfg.get("totp"))
+    approval_api_key = _first(approval_api_key) or defaults[0]
+    approval_secret = _first(approval_secret) or defaults[1]
+    totp_token = _first(totp_token) or defaults[2]
+    totp_secret = _first(totp_secret) or defaults[3]
+    totp = _first(totp) or defaults[4]
 
     if flow == "auto":
         flow = "approval" if (approval_api_key and approval_secret) else "totp"
@@ -191,19 +620,14 @@ def connect(
         return "", f"Auth error: {e}"
 
 
-def get_quote(token: str, trading_symbol: str, exchange: str, segment: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        return groww.get_quote(
-            trading_symbol=trading_symbol.strip().upper(),
-            exchange=exchange,
-            segment=segment,
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_quote(groww: GrowwAPI, trading_symbol: str, exchange: str, segment: str):
+    return groww.get_quote(
+        trading_symbol=_norm_symbol(trading_symbol),
+        exchange=exchange,
+        segment=segment,
+        timeout=10,
+    )
 
 
 def get_quote_clean(token: str, trading_symbol: str, exchange: str, segment: str):
@@ -213,132 +637,116 @@ def get_quote_clean(token: str, trading_symbol: str, exchange: str, segment: str
     return result
 
 
-def get_ltp(token: str, symbols: str, exchange: str, segment: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        exchange_symbols = _format_exchange_symbols(symbols, exchange)
-        return groww.get_ltp(exchange_symbols, segment, timeout=10)
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_ltp(groww: GrowwAPI, symbols: str, exchange: str, segment: str):
+    exchange_symbols = _format_exchange_symbols(symbols, exchange)
+    return groww.get_ltp(exchange_symbols, segment, timeout=10)
 
 
-def get_ohlc(token: str, symbols: str, exchange: str, segment: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        exchange_symbols = _format_exchange_symbols(symbols, exchange)
-        return groww.get_ohlc(exchange_symbols, segment, timeout=10)
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_ohlc(groww: GrowwAPI, symbols: str, exchange: str, segment: str):
+    exchange_symbols = _format_exchange_symbols(symbols, exchange)
+    return groww.get_ohlc(exchange_symbols, segment, timeout=10)
 
 
-def get_profile(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_user_profile(timeout=10)
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=PROFILE_CACHE_TTL)
+def get_profile(groww: GrowwAPI):
+    return groww.get_user_profile(timeout=10)
 
 
-def get_holdings(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_holdings_for_user(timeout=10)
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=HOLDINGS_CACHE_TTL)
+def get_holdings(groww: GrowwAPI):
+    return groww.get_holdings_for_user(timeout=10)
 
 
-def get_positions(token: str, segment: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_positions_for_user(
-            segment=segment or None, timeout=10
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_positions(groww: GrowwAPI, segment: str):
+    return groww.get_positions_for_user(segment=segment or None, timeout=10)
 
 
-def get_margin(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_available_margin_details(timeout=10)
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_margin(groww: GrowwAPI):
+    return groww.get_available_margin_details(timeout=10)
 
 
-def get_order_list(token: str, page: int, page_size: int, segment: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_order_list(
-            page=page or 0,
-            page_size=page_size or 25,
-            segment=segment or None,
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_order_list(groww: GrowwAPI, page: int, page_size: int, segment: str):
+    return groww.get_order_list(
+        page=page or 0,
+        page_size=page_size or 25,
+        segment=segment or None,
+        timeout=10,
+    )
 
 
-def get_order_detail(token: str, segment: str, order_id: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_order_detail(
-            segment=segment, groww_order_id=order_id.strip(), timeout=10
-        )
-    except Exception as e:
-        return {"error": str(e)}
+def get_order_list_pages(
+    token: str, page: int, page_size: int, segment: str, all_pages: bool
+):
+    # Generator handler: shows the requested page right away and, with
+    # all_pages, re-yields the merged order_list as each later page arrives.
+    first = get_order_list(token, page, page_size, segment)
+    yield first
+    # growwapi only sends the page number along with a segment; without one
+    # every request would return the same page.
+    if not all_pages or not segment or not isinstance(first, dict) or "error" in first:
+        return
+    orders = first.get("order_list")
+    if not isinstance(orders, list) or not orders:
+        return
+    merged = list(orders)
+    full_page = len(orders)
+    start = int(page or 0) + 1
+    for next_page in range(start, start + ORDER_LIST_MAX_PAGES - 1):
+        result = get_order_list(token, next_page, page_size, segment)
+        if isinstance(result, dict) and "error" in result:
+            yield {**first, "order_list": merged, "error": result["error"]}
+            return
+        orders = result.get("order_list") if isinstance(result, dict) else None
+        if not isinstance(orders, list) or not orders:
+            break
+        merged.extend(orders)
+        yield {**first, "order_list": merged}
+        if len(orders) < full_page:
+            break
+
+
+@_api
+def get_order_detail(groww: GrowwAPI, segment: str, order_id: str):
+    return groww.get_order_detail(
+        segment=segment, groww_order_id=order_id.strip(), timeout=10
+    )
 
 
-def get_order_status(token: str, segment: str, order_id: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_order_status(
-            segment=segment, groww_order_id=order_id.strip(), timeout=10
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_order_status(groww: GrowwAPI, segment: str, order_id: str):
+    return groww.get_order_status(
+        segment=segment, groww_order_id=order_id.strip(), timeout=10
+    )
 
 
-def get_order_status_by_reference(token: str, segment: str, reference_id: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_order_status_by_reference(
-            segment=segment, order_reference_id=reference_id.strip(), timeout=10
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_order_status_by_reference(groww: GrowwAPI, segment: str, reference_id: str):
+    return groww.get_order_status_by_reference(
+        segment=segment, order_reference_id=reference_id.strip(), timeout=10
+    )
 
 
+@_api
 def get_trade_list_for_order(
-    token: str, segment: str, order_id: str, page: int, page_size: int
+    groww: GrowwAPI, segment: str, order_id: str, page: int, page_size: int
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_trade_list_for_order(
-            groww_order_id=order_id.strip(),
-            segment=segment,
-            page=page or 0,
-            page_size=page_size or 25,
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return groww.get_trade_list_for_order(
+        groww_order_id=order_id.strip(),
+        segment=segment,
+        page=page or 0,
+        page_size=page_size or 25,
+        timeout=10,
+    )
 
 
+@_api
 def get_smart_order_list(
-    token: str,
+    groww: GrowwAPI,
     smart_order_type: str,
     segment: str,
     status: str,
@@ -347,168 +755,187 @@ def get_smart_order_list(
     start_date_time: str,
     end_date_time: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_smart_order_list(
-            smart_order_type=smart_order_type or None,
-            segment=segment or None,
-            status=status or None,
-            page=page or None,
-            page_size=page_size or None,
-            start_date_time=start_date_time or None,
-            end_date_time=end_date_time or None,
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return groww.get_smart_order_list(
+        smart_order_type=smart_order_type or None,
+        segment=segment or None,
+        status=status or None,
+        page=page or None,
+        page_size=page_size or None,
+        start_date_time=start_date_time or None,
+        end_date_time=end_date_time or None,
+        timeout=10,
+    )
 
 
-def get_smart_order(token: str, segment: str, smart_order_type: str, smart_order_id: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_smart_order(
-            segment=segment,
-            smart_order_type=smart_order_type,
-            smart_order_id=smart_order_id.strip(),
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_smart_order(groww: GrowwAPI, segment: str, smart_order_type: str, smart_order_id: str):
+    return groww.get_smart_order(
+        segment=segment,
+        smart_order_type=smart_order_type,
+        smart_order_id=smart_order_id.strip(),
+        timeout=10,
+    )
 
 
-def get_order_margin_details(token: str, segment: str, orders_json: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        orders = _parse_json(orders_json)
-        if not isinstance(orders, list):
-            return {"error": "orders_json must be a JSON list of order dicts"}
-        return _get_client(token).get_order_margin_details(
-            segment=segment, orders=orders, timeout=10
-        )
-    except Exception as e:
-        return {"error": str(e)}
+_MARGIN_ORDER_KEYS = (
+    "trading_symbol",
+    "transaction_type",
+    "quantity",
+    "price",
+    "order_type",
+    "product",
+    "exchange",
+)
+
+
+def _margin_orders_error(orders: object) -> str | None:
+    # One pass over the parsed basket; the SDK would otherwise fail with a
+    # bare KeyError on the first missing field.
+    if not isinstance(orders, list):
+        return "orders_json must be a JSON list of order dicts"
+    for index, order in enumerate(orders):
+        if not isinstance(order, dict):
+            return f"orders[{index}] must be a JSON object"
+        missing = [key for key in _MARGIN_ORDER_KEYS if key not in order]
+        if missing:
+            return f"orders[{index}] is missing: {', '.join(missing)}"
+    return None
 
 
-def get_instrument_by_exchange_and_trading_symbol(token: str, exchange: str, trading_symbol: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_instrument_by_exchange_and_trading_symbol(
-            exchange=exchange, trading_symbol=trading_symbol.strip().upper()
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api
+def get_order_margin_details(groww: GrowwAPI, segment: str, orders_json: str):
+    orders = _parse_json(orders_json)
+    error = _margin_orders_error(orders)
+    if error:
+        return {"error": error}
+    return groww.get_order_margin_details(segment=segment, orders=orders, timeout=10)
 
 
-def get_instrument_by_exchange_token(token: str, exchange_token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_instrument_by_exchange_token(
-            exchange_token=exchange_token.strip()
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=API_CACHE_TTL)
+def get_instrument_by_exchange_and_trading_symbol(groww: GrowwAPI, exchange: str, trading_symbol: str):
+    return groww.get_instrument_by_exchange_and_trading_symbol(
+        exchange=exchange, trading_symbol=_norm_symbol(trading_symbol)
+    )
 
 
-def get_instrument_by_groww_symbol(token: str, groww_symbol: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_instrument_by_groww_symbol(
-            groww_symbol=groww_symbol.strip()
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=API_CACHE_TTL)
+def get_instrument_by_exchange_token(groww: GrowwAPI, exchange_token: str):
+    return groww.get_instrument_by_exchange_token(exchange_token=exchange_token.strip())
 
 
-def get_expiries(token: str, exchange: str, underlying_symbol: str, year: int, month: int):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_expiries(
-            exchange=exchange,
-            underlying_symbol=underlying_symbol.strip().upper(),
-            year=year or None,
-            month=month or None,
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=API_CACHE_TTL)
+def get_instrument_by_groww_symbol(groww: GrowwAPI, groww_symbol: str):
+    return groww.get_instrument_by_groww_symbol(groww_symbol=groww_symbol.strip())
 
 
-def get_contracts(token: str, exchange: str, underlying_symbol: str, expiry_date: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_contracts(
-            exchange=exchange,
-            underlying_symbol=underlying_symbol.strip().upper(),
-            expiry_date=expiry_date.strip(),
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=EXPIRY_CACHE_TTL)
+def get_expiries(groww: GrowwAPI, exchange: str, underlying_symbol: str, year: int, month: int):
+    return groww.get_expiries(
+        exchange=exchange,
+        underlying_symbol=_norm_symbol(underlying_symbol),
+        year=year or None,
+        month=month or None,
+        timeout=10,
+    )
 
 
-def get_option_chain(token: str, exchange: str, underlying: str, expiry_date: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_option_chain(
-            exchange=exchange,
-            underlying=underlying.strip().upper(),
-            expiry_date=expiry_date.strip(),
-            timeout=10,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=EXPIRY_CACHE_TTL)
+def get_contracts(groww: GrowwAPI, exchange: str, underlying_symbol: str, expiry_date: str):
+    return groww.get_contracts(
+        exchange=exchange,
+        underlying_symbol=_norm_symbol(underlying_symbol),
+        expiry_date=expiry_date.strip(),
+        timeout=10,
+    )
 
 
-def get_greeks(token: str, exchange: str, underlying: str, trading_symbol: str, expiry: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_client(token).get_greeks(
-            exchange=exchange,
-            underlying=underlying.strip().upper(),
-            trading_symbol=trading_symbol.strip().upper(),
-            expiry=expiry.strip(),
-        )
-    except Exception as e:
-        return {"error": str(e)}
+@_api(ttl=API_CACHE_TTL)
+def get_option_chain(groww: GrowwAPI, exchange: str, underlying: str, expiry_date: str):
+    return groww.get_option_chain(
+        exchange=exchange,
+        underlying=_norm_symbol(underlying),
+        expiry_date=expiry_date.strip(),
+        timeout=10,
+    )
+
+
+@_api(shared=True)
+def get_greeks(groww: GrowwAPI, exchange: str, underlying: str, trading_symbol: str, expiry: str):
+    return groww.get_greeks(
+        exchange=exchange,
+        underlying=_norm_symbol(underlying),
+        trading_symbol=_norm_symbol(trading_symbol),
+        expiry=expiry.strip(),
+    )
 
 
 def call_method(token: str, method_name: str, args_json: str, kwargs_json: str, allow_trading: bool):
-    if not token:
-        return {"error": "Not connected"}
+    result = _call_method(token, method_name, args_json, kwargs_json, allow_trading)
+    # A trade changes what cached holdings/orders should show; drop them so
+    # the next click refetches instead of serving a pre-trade snapshot.
+    if method_name.strip() in _TRADING_METHODS and not (
+        isinstance(result, dict) and "error" in result
+    ):
+        _invalidate_api_cache(token, _TRADE_STALE_HANDLERS)
+    return result
+
+
+@_api
+def _call_method(groww: GrowwAPI, method_name: str, args_json: str, kwargs_json: str, allow_trading: bool):
     if not method_name.strip():
         return {"error": "Method name is required"}
-    try:
-        groww = _get_client(token)
-        if not hasattr(groww, method_name):
-            return {"error": f"Unknown method: {method_name}"}
-        method = getattr(groww, method_name)
-        if not callable(method):
-            return {"error": f"Not callable: {method_name}"}
-
-        _require_no_trading(method_name, allow_trading)
-
-        args = _parse_json(args_json) if args_json.strip() else []
-        kwargs = _parse_json(kwargs_json) if kwargs_json.strip() else {}
-        if not isinstance(args, list):
-            return {"error": "--args must be JSON array"}
-        if not isinstance(kwargs, dict):
-            return {"error": "--kwargs must be JSON object"}
-
-        return method(*args, **kwargs)
-    except Exception as e:
-        return {"error": str(e)}
+    method = getattr(groww, method_name, None)
+    if method is None:
+        return {"error": f"Unknown method: {method_name}"}
+    if not callable(method):
+        return {"error": f"Not callable: {method_name}"}
+
+    _require_no_trading(method_name, allow_trading)
+
+    args = _parse_json(args_json) if args_json.strip() else []
+    kwargs = _parse_json(kwargs_json) if kwargs_json.strip() else {}
+    if not isinstance(args, list):
+        return {"error": "--args must be JSON array"}
+    if not isinstance(kwargs, dict):
+        return {"error": "--kwargs must be JSON object"}
 
+    return method(*args, **kwargs)
 
+
+def _feed_instrument(
+    token: str,
+    exchange: str,
+    segment: str,
+    trading_symbol: str,
+    exchange_token: str,
+) -> dict:
+    instrument = _lookup_instrument(
+        _get_client(token), exchange, trading_symbol, exchange_token or None
+    )
+    return {
+        "exchange": exchange,
+        "segment": segment,
+        "exchange_token": instrument.get("exchange_token"),
+    }
+
+
+def _feed_subscribe(token: str, kind: str, *instrument: str):
+    return _subscription_result(
+        _queue_subscription(token, kind, _feed_instrument(token, *instrument))
+    )
+
+
+def _feed_instruments(exchange: str, segment: str, exchange_token: str) -> list[dict]:
+    return [
+        {
+            "exchange": exchange,
+            "segment": segment,
+            "exchange_token": exchange_token.strip(),
+        }
+    ]
+
+
+@_token_guard
 def feed_subscribe_ltp(
     token: str,
     exchange: str,
@@ -516,56 +943,30 @@ def feed_subscribe_ltp(
     trading_symbol: str,
     exchange_token: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        instrument = _lookup_instrument(
-            groww, exchange, trading_symbol, exchange_token or None
-        )
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": instrument.get("exchange_token"),
-            }
-        ]
-        feed = _get_feed(token)
-        return feed.subscribe_ltp(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    return _feed_subscribe(
+        token, "subscribe_ltp", exchange, segment, trading_symbol, exchange_token
+    )
 
 
+@_token_guard
+@_single_flight
 def feed_get_ltp(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_feed(token).get_ltp()
-    except Exception as e:
-        return {"error": str(e)}
+    return _get_feed(token).get_ltp()
 
 
+@_token_guard
 def feed_unsubscribe_ltp(
     token: str,
     exchange: str,
     segment: str,
     exchange_token: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": exchange_token.strip(),
-            }
-        ]
-        return _get_feed(token).unsubscribe_ltp(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    return _get_feed(token).unsubscribe_ltp(
+        _feed_instruments(exchange, segment, exchange_token)
+    )
 
 
+@_token_guard
 def feed_subscribe_market_depth(
     token: str,
     exchange: str,
@@ -573,56 +974,30 @@ def feed_subscribe_market_depth(
     trading_symbol: str,
     exchange_token: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        instrument = _lookup_instrument(
-            groww, exchange, trading_symbol, exchange_token or None
-        )
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": instrument.get("exchange_token"),
-            }
-        ]
-        feed = _get_feed(token)
-        return feed.subscribe_market_depth(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    return _feed_subscribe(
+        token, "subscribe_market_depth", exchange, segment, trading_symbol, exchange_token
+    )
 
 
+@_token_guard
+@_single_flight
 def feed_get_market_depth(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_feed(token).get_market_depth()
-    except Exception as e:
-        return {"error": str(e)}
+    return _get_feed(token).get_market_depth()
 
 
+@_token_guard
 def feed_unsubscribe_market_depth(
     token: str,
     exchange: str,
     segment: str,
     exchange_token: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": exchange_token.strip(),
-            }
-        ]
-        return _get_feed(token).unsubscribe_market_depth(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    return _get_feed(token).unsubscribe_market_depth(
+        _feed_instruments(exchange, segment, exchange_token)
+    )
 
 
+@_token_guard
 def feed_subscribe_index_value(
     token: str,
     exchange: str,
@@ -630,98 +1005,228 @@ def feed_subscribe_index_value(
     trading_symbol: str,
     exchange_token: str,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        instrument = _lookup_instrument(
-            groww, exchange, trading_symbol, exchange_token or None
-        )
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": instrument.get("exchange_token"),
-            }
-        ]
-        feed = _get_feed(token)
-        return feed.subscribe_index_value(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    return _feed_subscribe(
+        token, "subscribe_index_value", exchange, segment, trading_symbol, exchange_token
+    )
 
 
+@_token_guard
+@_single_flight
 def feed_get_index_value(token: str):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        return _get_feed(token).get_index_value()
-    except Exception as e:
-        return {"error": str(e)}
+    return _get_feed(token).get_index_value()
 
 
+@_token_guard
 def feed_unsubscribe_index_value(
     token: str,
     exchange: str,
     segment: str,
     exchange_token: str,
 ):
+    return _get_feed(token).unsubscribe_index_value(
+        _feed_instruments(exchange, segment, exchange_token)
+    )
+
+
+async def _feed_stream(getter, token: str):
+    # Pushes the feed snapshot over Gradio's event stream instead of one
+    # click per refresh; the reads run off the event loop because the first
+    # one may have to open the feed.
+    deadline = time.monotonic() + FEED_STREAM_MAX_SECONDS
+    while True:
+        snapshot = await asyncio.to_thread(getter, token)
+        yield snapshot
+        if isinstance(snapshot, dict) and "error" in snapshot:
+            return
+        if time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(FEED_STREAM_INTERVAL)
+
+
+async def feed_stream_ltp(token: str):
+    async for snapshot in _feed_stream(feed_get_ltp, token):
+        yield snapshot
+
+
+async def feed_stream_market_depth(token: str):
+    async for snapshot in _feed_stream(feed_get_market_depth, token):
+        yield snapshot
+
+
+async def feed_stream_index_value(token: str):
+    async for snapshot in _feed_stream(feed_get_index_value, token):
+        yield snapshot
+
+
+def feed_subscribe_all(
+    token: str,
+    ltp_exchange: str,
+    ltp_segment: str,
+    ltp_symbol: str,
+    ltp_exchange_token: str,
+    depth_exchange: str,
+    depth_segment: str,
+    depth_symbol: str,
+    depth_exchange_token: str,
+    index_exchange: str,
+    index_segment: str,
+    index_symbol: str,
+    index_exchange_token: str,
+):
+    # Look the three instruments up in parallel, then queue them in one go
+    # so they share a single flush; each output still gets its own result
+    # or error.
     if not token:
-        return {"error": "Not connected"}
-    try:
-        instrument_list = [
-            {
-                "exchange": exchange,
-                "segment": segment,
-                "exchange_token": exchange_token.strip(),
-            }
+        return ({"error": "Not connected"},) * 3
+    subscriptions = (
+        ("subscribe_ltp", (ltp_exchange, ltp_segment, ltp_symbol, ltp_exchange_token)),
+        ("subscribe_market_depth", (depth_exchange, depth_segment, depth_symbol, depth_exchange_token)),
+        ("subscribe_index_value", (index_exchange, index_segment, index_symbol, index_exchange_token)),
+    )
+    with ThreadPoolExecutor(max_workers=len(subscriptions)) as pool:
+        lookups = [
+            pool.submit(_feed_instrument, token, *instrument)
+            for _, instrument in subscriptions
         ]
-        return _get_feed(token).unsubscribe_index_value(instrument_list)
-    except Exception as e:
-        return {"error": str(e)}
+    items = []
+    results: list[dict | None] = []
+    for (kind, _), lookup in zip(subscriptions, lookups):
+        try:
+            items.append((kind, lookup.result()))
+            results.append(None)
+        except Exception as e:
+            results.append({"error": str(e)})
+    waiters = iter(_queue_subscriptions(token, items))
+    for index, result in enumerate(results):
+        if result is not None:
+            continue
+        try:
+            results[index] = _subscription_result(next(waiters))
+        except Exception as e:
+            results[index] = {"error": str(e)}
+    return tuple(results)
+
+
+_SEARCH_COLS = ("trading_symbol", "groww_symbol", "name", "isin")
+_RESULT_COLS = (
+    "trading_symbol",
+    "groww_symbol",
+    "name",
+    "isin",
+    "exchange_token",
+    "exchange",
+    "segment",
+    "instrument_type",
+)
+_CATEGORY_COLS = ("exchange", "segment", "instrument_type")
+SEARCH_MAX_LIMIT = 200
+
+
+def _cache_instruments(df):
+    # Lowercase the searchable columns once and index row positions by
+    # (EXCHANGE, SEGMENT) so each search only scans the rows it needs.
+    # The low-cardinality columns are stored as categories; the caller hands
+    # the converted frame back to the SDK client so only one copy is kept.
+    df = df.astype({col: "category" for col in _CATEGORY_COLS if col in df.columns})
+    lower = {
+        col: df[col].astype("string").str.lower()
+        for col in _SEARCH_COLS
+        if col in df.columns
+    }
+    keys = [
+        df[col].astype(str).str.upper() if col in df.columns else pd.Series("", index=df.index)
+        for col in ("exchange", "segment")
+    ]
+    groups = df.groupby(keys, sort=False).indices if len(df) else {}
+    INSTRUMENT_CACHE["lower"] = lower
+    INSTRUMENT_CACHE["groups"] = groups
+    INSTRUMENT_CACHE["cols"] = [c for c in _RESULT_COLS if c in df.columns]
+    INSTRUMENT_CACHE["df"] = df
+    _search_positions.cache_clear()
+    return df
+
+
+def _load_instruments(token: str) -> None:
+    if INSTRUMENT_CACHE["df"] is not None:
+        return
+    with _INSTRUMENT_LOCK:
+        if INSTRUMENT_CACHE["df"] is None:
+            groww = _get_client(token)
+            # GrowwAPI keeps the master on the instance and filters it with
+            # plain == compares, which work on categories too.
+            groww.instruments = _cache_instruments(groww.get_all_instruments())
+
 
+def _preload_instruments(token: str) -> None:
+    # A failure here just leaves the first search to fetch (and report) it.
+    try:
+        _load_instruments(token)
+    except Exception:
+        _LOG.warning("Instrument preload failed", exc_info=True)
+
+
+def preload_instruments(token: str) -> None:
+    # Opening the search tab starts the instrument master download in the
+    # background, so sessions that never search don't pay for it.
+    if token and INSTRUMENT_CACHE["df"] is None:
+        threading.Thread(
+            target=_preload_instruments, args=(token,), daemon=True
+        ).start()
 
+
+def _instrument_rows(exchange: str, segment: str):
+    if not exchange and not segment:
+        return None
+    exchange = (exchange or "").upper()
+    segment = (segment or "").upper()
+    parts = [
+        positions
+        for (ex, seg), positions in INSTRUMENT_CACHE["groups"].items()
+        if (not exchange or ex == exchange) and (not segment or seg == segment)
+    ]
+    if not parts:
+        return np.empty(0, dtype=np.intp)
+    return np.sort(np.concatenate(parts))
+
+
+@functools.lru_cache(maxsize=2048)
+def _search_positions(q: str, exchange: str, segment: str) -> np.ndarray:
+    # Memoized per normalized query; _cache_instruments clears it. Only the
+    # first SEARCH_MAX_LIMIT hits are kept so entries stay small.
+    rows = _instrument_rows(exchange, segment)
+    masks = []
+    for series in INSTRUMENT_CACHE["lower"].values():
+        if rows is not None:
+            series = series.iloc[rows]
+        masks.append(series.str.contains(q, regex=False, na=False).to_numpy(dtype=bool))
+    mask = np.logical_or.reduce(masks)
+    positions = np.flatnonzero(mask) if rows is None else rows[mask]
+    positions = positions[:SEARCH_MAX_LIMIT]
+    positions.flags.writeable = False
+    return positions
+
+
+@_single_flight
 def search_instruments(token: str, query: str, exchange: str, segment: str, limit: int):
     if not token:
         return "Not connected"
     try:
-        groww = _get_client(token)
-        if INSTRUMENT_CACHE["df"] is None:
-            INSTRUMENT_CACHE["df"] = groww.get_all_instruments()
+        _load_instruments(token)
         df = INSTRUMENT_CACHE["df"]
         q = query.strip().lower()
         if not q:
             return "Enter a search term."
 
-        filtered = df
-        if exchange:
-            filtered = filtered[filtered["exchange"].str.upper() == exchange.upper()]
-        if segment:
-            filtered = filtered[filtered["segment"].str.upper() == segment.upper()]
-
-        cols = [
-            "trading_symbol",
-            "groww_symbol",
-            "name",
-            "isin",
-            "exchange_token",
-            "exchange",
-            "segment",
-            "instrument_type",
-        ]
-        cols = [c for c in cols if c in filtered.columns]
-
-        mask = None
-        for col in ["trading_symbol", "groww_symbol", "name", "isin"]:
-            if col in filtered.columns:
-                m = filtered[col].astype(str).str.lower().str.contains(q, na=False)
-                mask = m if mask is None else (mask | m)
-        if mask is None:
+        if not INSTRUMENT_CACHE["lower"]:
             return "No instruments found."
 
-        view = filtered[mask].head(limit)
+        positions = _search_positions(
+            q, (exchange or "").strip().upper(), (segment or "").strip().upper()
+        )
+        view = df.iloc[positions[: int(limit)]]
         if view.empty:
             return "No instruments found."
-        return view[cols]
+        return view[INSTRUMENT_CACHE["cols"]]
     except Exception as e:
         return f"Error: {e}"
 
@@ -761,7 +1266,7 @@ def get_historical(
             )
         else:
             data = groww.get_historical_candle_data(
-                trading_symbol=trading_symbol.strip().upper(),
+                trading_symbol=_norm_symbol(trading_symbol),
                 exchange=exchange,
                 segment=segment,
                 start_time=start_time,
@@ -769,84 +1274,119 @@ def get_historical(
                 interval_in_minutes=interval_minutes or None,
                 timeout=15,
             )
-        return data, _candles_to_rows(data)
+        candles = _extract_candles(data)
+        table = _candles_table(candles)
+        return _historical_summary(data, candles, table), table
     except Exception as e:
         return {"error": str(e)}, []
 
 
+_CANDLE_KEYS = ("candles", "data", "candle_data", "historical_data", "result")
+
+
 def _extract_candles(data: object) -> list:
-    if isinstance(data, dict):
-        for key in ("candles", "data", "candle_data", "historical_data", "result"):
+    if data.__class__ is dict:
+        for key in _CANDLE_KEYS:
             value = data.get(key)
-            if isinstance(value, list):
+            if value.__class__ is list:
                 return value
-    if isinstance(data, list):
+    elif data.__class__ is list:
         return data
     return []
 
 
-def _format_ts(value: object) -> str | None:
-    if value is None:
-        return None
-    try:
-        ts = float(value)
-    except (TypeError, ValueError):
-        return str(value)
+_CANDLE_FIELDS = {
+    "timestamp": ("timestamp", "time", "t", "date"),
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c"),
+    "volume": ("volume", "v"),
+}
+
+
+def _format_ts_series(values: pd.Series) -> pd.Series:
+    nums = pd.to_numeric(values, errors="coerce")
     # Heuristic: >1e12 likely ms; >1e9 likely seconds.
-    if ts > 1_000_000_000_000:
-        ts = ts / 1000.0
-    try:
-        return dt.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-    except (OSError, OverflowError, ValueError):
-        return str(value)
-
-
-def _candles_to_rows(data: object) -> list[dict]:
-    rows = []
-    for candle in _extract_candles(data):
-        row: dict[str, object] = {}
-        if isinstance(candle, dict):
-            row["timestamp"] = _format_ts(
-                candle.get("timestamp")
-                or candle.get("time")
-                or candle.get("t")
-                or candle.get("date")
-            )
-            row["open"] = candle.get("open") or candle.get("o")
-            row["high"] = candle.get("high") or candle.get("h")
-            row["low"] = candle.get("low") or candle.get("l")
-            row["close"] = candle.get("close") or candle.get("c")
-            row["volume"] = candle.get("volume") or candle.get("v")
-        elif isinstance(candle, (list, tuple)):
-            row["timestamp"] = _format_ts(candle[0] if len(candle) > 0 else None)
-            row["open"] = candle[1] if len(candle) > 1 else None
-            row["high"] = candle[2] if len(candle) > 2 else None
-            row["low"] = candle[3] if len(candle) > 3 else None
-            row["close"] = candle[4] if len(candle) > 4 else None
-            row["volume"] = candle[5] if len(candle) > 5 else None
-        else:
-            continue
-        rows.append(row)
-    return rows
+    secs = nums.where(nums <= 1_000_000_000_000, nums / 1000.0)
+    stamps = pd.to_datetime(secs, unit="s", utc=True, errors="coerce")
+    local = stamps.dt.tz_convert(tzlocal()).dt.tz_localize(None)
+    # datetime_as_string formats the whole array in C; per-element strftime
+    # was the remaining per-row cost.
+    iso = np.datetime_as_string(local.to_numpy(dtype="datetime64[s]"), unit="s")
+    text = pd.Series(np.char.replace(iso, "T", " "), index=values.index, dtype=object)
+    # Non-numeric or out-of-range (NaT) values are shown as-is, like before.
+    raw = values.astype(str).astype(object).where(values.notna(), None)
+    return text.where(local.notna(), raw)
+
+
+def _candles_frame(candles: list) -> pd.DataFrame:
+    if isinstance(candles[0], dict):
+        raw = pd.DataFrame.from_records([c for c in candles if isinstance(c, dict)])
+        frame = pd.DataFrame(index=raw.index)
+        for field, aliases in _CANDLE_FIELDS.items():
+            column = None
+            for alias in aliases:
+                if alias in raw.columns:
+                    column = raw[alias] if column is None else column.combine_first(raw[alias])
+            frame[field] = column
+    else:
+        rows = [c[:6] for c in candles if isinstance(c, (list, tuple))]
+        frame = pd.DataFrame(rows).reindex(columns=range(6))
+        frame.columns = list(_CANDLE_FIELDS)
+    frame["timestamp"] = _format_ts_series(frame["timestamp"])
+    return frame
+
+
+def _candles_table(candles: list) -> pd.DataFrame:
+    candles = [c for c in candles if isinstance(c, (dict, list, tuple))]
+    if not candles:
+        return pd.DataFrame(columns=list(_CANDLE_FIELDS))
+    return _candles_frame(candles)
+
+
+def _historical_summary(data: object, candles: list, table: pd.DataFrame) -> dict:
+    # The table carries the candles; the JSON panel keeps only the response
+    # metadata so the payload is not sent twice.
+    summary = {}
+    if isinstance(data, dict):
+        summary = {key: value for key, value in data.items() if value is not candles}
+    summary["candle_count"] = len(table)
+    if len(table):
+        summary["first_timestamp"] = table["timestamp"].iloc[0]
+        summary["last_timestamp"] = table["timestamp"].iloc[-1]
+    return summary
+
+_CLOSE_NUMERIC = (int, float)
+
 
 def _parse_candle_close(candle: object) -> float | None:
     if isinstance(candle, dict):
-        for key in ("close", "c"):
-            if key in candle:
-                try:
-                    return float(candle[key])
-                except (TypeError, ValueError):
-                    return None
-    if isinstance(candle, (list, tuple)) and len(candle) >= 5:
-        try:
-            return float(candle[4])
-        except (TypeError, ValueError):
+        if "close" in candle:
+            value = candle["close"]
+        elif "c" in candle:
+            value = candle["c"]
+        else:
             return None
-    return None
+    elif isinstance(candle, (list, tuple)) and len(candle) >= 5:
+        value = candle[4]
+    else:
+        return None
+    # Parsed JSON gives plain numbers; only strings and odd types need the
+    # guarded conversion.
+    if isinstance(value, _CLOSE_NUMERIC):
+        return float(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
 
 
+@_api
 def backtest_simple(
-    token: str,
+    groww: GrowwAPI,
     trading_symbol: str,
     exchange: str,
     segment: str,
@@ -854,43 +1394,67 @@ def backtest_simple(
     end_time: str,
     interval_minutes: int,
 ):
-    if not token:
-        return {"error": "Not connected"}
-    try:
-        groww = _get_client(token)
-        data = groww.get_historical_candle_data(
-            trading_symbol=trading_symbol.strip().upper(),
-            exchange=exchange,
-            segment=segment,
-            start_time=start_time,
-            end_time=end_time,
-            interval_in_minutes=interval_minutes or None,
-            timeout=15,
-        )
-        candles = _extract_candles(data)
-        closes = [c for c in (_parse_candle_close(x) for x in candles) if c is not None]
-        if len(closes) < 2:
-            return {"error": "Not enough candle data to compute backtest summary."}
-        start_close = closes[0]
-        end_close = closes[-1]
-        return {
-            "count": len(closes),
-            "start_close": start_close,
-            "end_close": end_close,
-            "return_pct": ((end_close - start_close) / start_close) * 100.0,
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    data = groww.get_historical_candle_data(
+        trading_symbol=_norm_symbol(trading_symbol),
+        exchange=exchange,
+        segment=segment,
+        start_time=start_time,
+        end_time=end_time,
+        interval_in_minutes=interval_minutes or None,
+        timeout=15,
+    )
+    candles = _extract_candles(data)
+    closes = np.fromiter(
+        (np.nan if c is None else c for c in map(_parse_candle_close, candles)),
+        dtype=np.float64,
+        count=len(candles),
+    )
+    closes = closes[~np.isnan(closes)]
+    if closes.size < 2:
+        return {"error": "Not enough candle data to compute backtest summary."}
+    return _backtest_stats(closes)
+
+
+def _backtest_stats(closes: np.ndarray) -> dict:
+    start_close = float(closes[0])
+    end_close = float(closes[-1])
+    # Drawdown from the running peak and per-candle simple returns, all as
+    # whole-array NumPy operations. Zero closes are masked out of every
+    # denominator so a bad candle cannot turn the stats into inf/nan.
+    peaks = np.maximum.accumulate(closes)
+    drawdown = np.divide(
+        closes - peaks, peaks, out=np.zeros_like(closes), where=peaks > 0
+    )
+    prev = closes[:-1]
+    valid = prev != 0
+    returns = np.diff(closes)[valid] / prev[valid]
+    std = float(returns.std(ddof=1)) if returns.size > 1 else 0.0
+    return {
+        "count": int(closes.size),
+        "start_close": start_close,
+        "end_close": end_close,
+        "return_pct": (
+            ((end_close - start_close) / start_close) * 100.0 if start_close else None
+        ),
+        "max_drawdown_pct": float(drawdown.min()) * 100.0,
+        "volatility_pct": std * 100.0,
+        # Mean over std of per-candle returns, not annualized: the candle
+        # interval varies per request.
+        "sharpe_per_bar": float(returns.mean()) / std if std else None,
+    }
 
 
+@functools.cache
 def list_methods() -> str:
     lines = []
-    for name, fn in inspect.getmembers(GrowwAPI, predicate=inspect.isfunction):
+    for name, attr in sorted(vars(GrowwAPI).items()):
         if name.startswith("_"):
             continue
+        fn = attr.__func__ if isinstance(attr, (staticmethod, classmethod)) else attr
+        if not inspect.isfunction(fn):
+            continue
         sig = str(inspect.signature(fn))
-        doc = inspect.getdoc(fn) or ""
-        summary = doc.splitlines()[0] if doc else ""
+        summary = (fn.__doc__ or "").strip().split("\n", 1)[0].strip()
         if summary:
             lines.append(f"- {name}{sig} — {summary}")
         else:
@@ -898,6 +1462,14 @@ def list_methods() -> str:
     return "\n".join(lines)
 
 
+# Fill the cache off the request path so the first "List Methods" click is instant.
+threading.Thread(target=list_methods, daemon=True).start()
+
+
+_EX = ("NSE", "BSE")
+_SEG = ("CASH", "FNO")
+_SEG_OPT = ("", "CASH", "FNO")
+
 with gr.Blocks(title="Groww API Explorer") as demo:
     gr.Markdown("# Groww API Explorer")
     gr.Markdown(
@@ -942,8 +1514,8 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         gr.Markdown("### Quote (single symbol)")
         with gr.Row():
             q_symbol = gr.Textbox(value="WIPRO", label="trading_symbol")
-            q_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            q_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            q_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            q_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         q_clean = gr.Checkbox(value=True, label="Hide null fields")
         with gr.Row():
             q_btn = gr.Button("Get Quote")
@@ -956,8 +1528,8 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         symbols = gr.Textbox(
             value="WIPRO,RELIANCE", label="symbols (comma‑separated)"
         )
-        ltp_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-        ltp_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+        ltp_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+        ltp_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         with gr.Row():
             ltp_btn = gr.Button("Get LTP")
             ohlc_btn = gr.Button("Get OHLC")
@@ -969,12 +1541,14 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         gr.Markdown("### Market Depth (Feed)")
         with gr.Row():
             md_symbol = gr.Textbox(value="WIPRO", label="trading_symbol")
-            md_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            md_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            md_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            md_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         md_exchange_token = gr.Textbox(label="exchange_token (optional)")
         with gr.Row():
             md_sub_btn = gr.Button("Subscribe Depth")
             md_get_btn = gr.Button("Get Depth")
+            md_stream_btn = gr.Button("Stream Depth")
+            md_stop_btn = gr.Button("Stop")
             md_unsub_btn = gr.Button("Unsubscribe Depth")
         md_out = gr.JSON()
         md_sub_btn.click(
@@ -983,10 +1557,18 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             outputs=md_out,
         )
         md_get_btn.click(feed_get_market_depth, inputs=[token_state], outputs=md_out)
+        md_stream = md_stream_btn.click(
+            feed_stream_market_depth,
+            inputs=[token_state],
+            outputs=md_out,
+            show_progress="hidden",
+        )
+        md_stop_btn.click(None, cancels=[md_stream])
         md_unsub_btn.click(
             feed_unsubscribe_market_depth,
             inputs=[token_state, md_exchange, md_segment, md_exchange_token],
             outputs=md_out,
+            cancels=[md_stream],
         )
 
     with gr.Tab("Portfolio"):
@@ -999,9 +1581,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         holdings_btn.click(get_holdings, inputs=[token_state], outputs=holdings_out)
 
         gr.Markdown("### Positions")
-        pos_segment = gr.Dropdown(
-            ["", "CASH", "FNO"], value="", label="segment (optional)"
-        )
+        pos_segment = gr.Dropdown(list(_SEG_OPT), value="", label="segment (optional)")
         pos_btn = gr.Button("Get Positions")
         pos_out = gr.JSON()
         pos_btn.click(get_positions, inputs=[token_state, pos_segment], outputs=pos_out)
@@ -1017,7 +1597,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             lines=6,
             placeholder='[{"segment":"CASH","exchange":"NSE","trading_symbol":"WIPRO","transaction_type":"BUY","quantity":1,"product":"CNC","order_type":"MARKET"}]',
         )
-        orders_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+        orders_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         orders_margin_btn = gr.Button("Get Order Margin")
         orders_margin_out = gr.JSON()
         orders_margin_btn.click(
@@ -1031,19 +1611,21 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         with gr.Row():
             order_page = gr.Number(value=0, precision=0, label="page")
             order_page_size = gr.Number(value=25, precision=0, label="page_size")
-            order_segment = gr.Dropdown(["", "CASH", "FNO"], value="", label="segment (optional)")
+            order_segment = gr.Dropdown(list(_SEG_OPT), value="", label="segment (optional)")
+            order_all_pages = gr.Checkbox(value=False, label="all pages (needs segment)")
         order_list_btn = gr.Button("Get Orders")
         order_list_out = gr.JSON()
         order_list_btn.click(
-            get_order_list,
-            inputs=[token_state, order_page, order_page_size, order_segment],
+            get_order_list_pages,
+            inputs=[token_state, order_page, order_page_size, order_segment, order_all_pages],
             outputs=order_list_out,
+            show_progress="minimal",
         )
 
         gr.Markdown("### Order Detail / Status")
         with gr.Row():
             order_id = gr.Textbox(label="groww_order_id")
-            order_seg = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            order_seg = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         with gr.Row():
             order_detail_btn = gr.Button("Get Order Detail")
             order_status_btn = gr.Button("Get Order Status")
@@ -1086,7 +1668,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         gr.Markdown("### Smart Order List")
         with gr.Row():
             so_type = gr.Dropdown(["", "GTT", "OCO"], value="", label="smart_order_type (optional)")
-            so_segment = gr.Dropdown(["", "CASH", "FNO"], value="", label="segment (optional)")
+            so_segment = gr.Dropdown(list(_SEG_OPT), value="", label="segment (optional)")
             so_status = gr.Textbox(label="status (optional)")
         with gr.Row():
             so_page = gr.Number(value=0, precision=0, label="page (optional)")
@@ -1112,11 +1694,11 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             outputs=so_detail_out,
         )
 
-    with gr.Tab("Instrument Search"):
+    with gr.Tab("Instrument Search") as search_tab:
         search_query = gr.Textbox(label="search name/symbol/isin")
         s_exchange = gr.Textbox(label="exchange filter (optional)")
         s_segment = gr.Textbox(label="segment filter (optional)")
-        s_limit = gr.Slider(1, 200, value=25, step=1, label="limit")
+        s_limit = gr.Slider(1, SEARCH_MAX_LIMIT, value=25, step=1, label="limit")
         search_btn = gr.Button("Search")
         search_out = gr.Dataframe(label="results")
         search_btn.click(
@@ -1124,11 +1706,14 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             inputs=[token_state, search_query, s_exchange, s_segment, s_limit],
             outputs=search_out,
         )
+        search_tab.select(
+            preload_instruments, inputs=token_state, outputs=None, queue=False
+        )
 
     with gr.Tab("Derivatives"):
         gr.Markdown("### Expiries")
         with gr.Row():
-            exp_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
+            exp_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
             exp_underlying = gr.Textbox(label="underlying_symbol (e.g. NIFTY)")
             exp_year = gr.Number(value=0, precision=0, label="year (optional)")
             exp_month = gr.Number(value=0, precision=0, label="month (optional)")
@@ -1142,7 +1727,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
 
         gr.Markdown("### Contracts")
         with gr.Row():
-            con_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
+            con_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
             con_underlying = gr.Textbox(label="underlying_symbol (e.g. NIFTY)")
             con_expiry = gr.Textbox(label="expiry_date (yyyy-MM-dd)")
         con_btn = gr.Button("Get Contracts")
@@ -1155,7 +1740,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
 
         gr.Markdown("### Option Chain")
         with gr.Row():
-            oc_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
+            oc_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
             oc_underlying = gr.Textbox(label="underlying (e.g. NIFTY)")
             oc_expiry = gr.Textbox(label="expiry_date (yyyy-MM-dd)")
         oc_btn = gr.Button("Get Option Chain")
@@ -1168,7 +1753,7 @@ with gr.Blocks(title="Groww API Explorer") as demo:
 
         gr.Markdown("### Greeks")
         with gr.Row():
-            gr_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
+            gr_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
             gr_underlying = gr.Textbox(label="underlying (e.g. NIFTY)")
             gr_symbol = gr.Textbox(label="trading_symbol (option/future)")
             gr_expiry = gr.Textbox(label="expiry (yyyy-MM-dd)")
@@ -1193,8 +1778,8 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             h_symbol = gr.Textbox(value="WIPRO", label="trading_symbol")
             h_groww_symbol = gr.Textbox(label="groww_symbol (for v2)")
         with gr.Row():
-            h_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            h_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            h_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            h_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         with gr.Row():
             h_interval_min = gr.Number(value=5, precision=0, label="interval_in_minutes")
             h_candle_interval = gr.Dropdown(
@@ -1236,8 +1821,8 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         gr.Markdown("Compute a simple return between first/last candle in a range.")
         with gr.Row():
             bt_symbol = gr.Textbox(value="WIPRO", label="trading_symbol")
-            bt_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            bt_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            bt_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            bt_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         with gr.Row():
             bt_start = gr.Textbox(label="start_time (yyyy-MM-dd HH:mm:ss)")
             bt_end = gr.Textbox(label="end_time (yyyy-MM-dd HH:mm:ss)")
@@ -1254,12 +1839,14 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         gr.Markdown("Subscribe to live feeds (LTP / Index). Use exchange_token from Instrument Search.")
         with gr.Row():
             fd_symbol = gr.Textbox(value="WIPRO", label="trading_symbol")
-            fd_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            fd_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            fd_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            fd_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         fd_exchange_token = gr.Textbox(label="exchange_token (optional)")
         with gr.Row():
             fd_ltp_sub = gr.Button("Subscribe LTP")
             fd_ltp_get = gr.Button("Get LTP Feed")
+            fd_ltp_stream_btn = gr.Button("Stream LTP Feed")
+            fd_ltp_stop = gr.Button("Stop")
             fd_ltp_unsub = gr.Button("Unsubscribe LTP")
         fd_ltp_out = gr.JSON()
         fd_ltp_sub.click(
@@ -1268,21 +1855,31 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             outputs=fd_ltp_out,
         )
         fd_ltp_get.click(feed_get_ltp, inputs=[token_state], outputs=fd_ltp_out)
+        fd_ltp_stream = fd_ltp_stream_btn.click(
+            feed_stream_ltp,
+            inputs=[token_state],
+            outputs=fd_ltp_out,
+            show_progress="hidden",
+        )
+        fd_ltp_stop.click(None, cancels=[fd_ltp_stream])
         fd_ltp_unsub.click(
             feed_unsubscribe_ltp,
             inputs=[token_state, fd_exchange, fd_segment, fd_exchange_token],
             outputs=fd_ltp_out,
+            cancels=[fd_ltp_stream],
         )
 
         gr.Markdown("### Index Feed")
         with gr.Row():
             idx_symbol = gr.Textbox(value="NIFTY", label="trading_symbol")
-            idx_exchange = gr.Dropdown(["NSE", "BSE"], value="NSE", label="exchange")
-            idx_segment = gr.Dropdown(["CASH", "FNO"], value="CASH", label="segment")
+            idx_exchange = gr.Dropdown(list(_EX), value="NSE", label="exchange")
+            idx_segment = gr.Dropdown(list(_SEG), value="CASH", label="segment")
         idx_exchange_token = gr.Textbox(label="exchange_token (optional)")
         with gr.Row():
             idx_sub = gr.Button("Subscribe Index")
             idx_get = gr.Button("Get Index Feed")
+            idx_stream_btn = gr.Button("Stream Index Feed")
+            idx_stop = gr.Button("Stop")
             idx_unsub = gr.Button("Unsubscribe Index")
         idx_out = gr.JSON()
         idx_sub.click(
@@ -1291,10 +1888,41 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             outputs=idx_out,
         )
         idx_get.click(feed_get_index_value, inputs=[token_state], outputs=idx_out)
+        idx_stream = idx_stream_btn.click(
+            feed_stream_index_value,
+            inputs=[token_state],
+            outputs=idx_out,
+            show_progress="hidden",
+        )
+        idx_stop.click(None, cancels=[idx_stream])
         idx_unsub.click(
             feed_unsubscribe_index_value,
             inputs=[token_state, idx_exchange, idx_segment, idx_exchange_token],
             outputs=idx_out,
+            cancels=[idx_stream],
+        )
+
+        gr.Markdown("### All Feeds")
+        gr.Markdown("Subscribes LTP and Index above plus Market Depth from the Live Data tab.")
+        sub_all_btn = gr.Button("Subscribe All")
+        sub_all_btn.click(
+            feed_subscribe_all,
+            inputs=[
+                token_state,
+                fd_exchange,
+                fd_segment,
+                fd_symbol,
+                fd_exchange_token,
+                md_exchange,
+                md_segment,
+                md_symbol,
+                md_exchange_token,
+                idx_exchange,
+                idx_segment,
+                idx_symbol,
+                idx_exchange_token,
+            ],
+            outputs=[fd_ltp_out, md_out, idx_out],
         )
 
     with gr.Tab("SDK Methods"):
@@ -1302,6 +1930,28 @@ with gr.Blocks(title="Groww API Explorer") as demo:
         methods_btn = gr.Button("List Methods")
         methods_btn.click(list_methods, inputs=[], outputs=methods_md)
 
+    # Show symbols the way they are sent: trimmed and upper-cased.
+    for symbol_box in (
+        q_symbol,
+        md_symbol,
+        exp_underlying,
+        con_underlying,
+        oc_underlying,
+        gr_underlying,
+        gr_symbol,
+        h_symbol,
+        bt_symbol,
+        fd_symbol,
+        idx_symbol,
+    ):
+        symbol_box.blur(
+            _norm_symbol,
+            inputs=symbol_box,
+            outputs=symbol_box,
+            queue=False,
+            show_progress="hidden",
+        )
+
     with gr.Tab("Method Call"):
         allow_trading = gr.Checkbox(value=False, label="Allow trading actions")
         method_name = gr.Textbox(label="method name (e.g. get_quote)")
@@ -1313,7 +1963,18 @@ with gr.Blocks(title="Groww API Explorer") as demo:
             call_method,
             inputs=[token_state, method_name, method_args, method_kwargs, allow_trading],
             outputs=call_out,
+            # Can place/modify/cancel orders; keep those strictly one at a time.
+            concurrency_limit=1,
         )
 
+# Handlers are thread-safe I/O-bound SDK calls, so let events run in
+# parallel instead of Gradio's default of one at a time per event.
+demo.queue(default_concurrency_limit=None, max_size=64)
+
 if __name__ == "__main__":
-    demo.launch(server_name="127.0.0.1", server_port=7860, share=True)
+    demo.launch(
+        server_name="127.0.0.1",
+        server_port=7860,
+        share=True,
+        max_threads=WORKER_THREADS,
+    )
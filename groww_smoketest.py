@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 from pathlib import Path
 import tomllib
@@ -9,17 +10,23 @@ from growwapi import GrowwAPI
 
 
 def _load_toml(path: Path) -> dict:
-    if not path.exists():
+    try:
+        with path.open("rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
         return {}
-    with path.open("rb") as f:
-        return tomllib.load(f)
 
 
 def _first(*values: object) -> str | None:
     for value in values:
         if value is None:
             continue
-        value = str(value).strip()
+        if type(value) is str:
+            # TOML/env values rarely carry padding; only strip when needed.
+            if value and (value[0].isspace() or value[-1].isspace()):
+                value = value.strip()
+        else:
+            value = str(value).strip()
         if value:
             return value
     return None
@@ -34,12 +41,18 @@ def _safe_summary(value: object) -> str:
     return type(value).__name__
 
 
+@functools.lru_cache(maxsize=4)
+def _totp_obj(totp_secret: str):
+    import pyotp
+
+    return pyotp.TOTP(totp_secret)
+
+
 def _totp_now_from_secret(totp_secret: str) -> str:
     import binascii
-    import pyotp
 
     try:
-        return pyotp.TOTP(str(totp_secret)).now()
+        return _totp_obj(str(totp_secret)).now()
     except (binascii.Error, ValueError) as e:
         raise ValueError(
             "Invalid `totp_secret`: it must be the Base32 TOTP secret from the QR setup. "
@@ -0,0 +1,33 @@
+import pytest
+
+import groww_cli
+
+
+def test_print_response_default_is_ascii(capsys):
+    groww_cli._print_response({"name": "Café", "n": 1})
+    assert capsys.readouterr().out == '{\n  "name": "Caf\\u00e9",\n  "n": 1\n}\n'
+
+
+def test_print_response_compact(capsys):
+    groww_cli._print_response({"name": "Café", "n": [1, 2]}, compact=True)
+    assert capsys.readouterr().out == '{"name":"Café","n":[1,2]}\n'
+
+
+def test_print_response_not_json(capsys):
+    groww_cli._print_response({1, 2})
+    assert capsys.readouterr().out == "{1, 2}\n"
+
+
+def test_holdings_match_nested_fields():
+    entries = groww_cli._extract_holdings(
+        {"holdings": [{"tradingSymbol": "WIPRO", "meta": {"sector": "IT Services"}}]}
+    )
+    assert groww_cli._holding_matches(entries[0], "it services")
+    assert not groww_cli._holding_matches(entries[0], "banking")
+
+
+def test_list_methods_with_unknown_flag_is_rejected(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["groww_cli.py", "--list-methods", "--bogus"])
+    with pytest.raises(SystemExit) as exc:
+        groww_cli.main()
+    assert exc.value.code == 2
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("growwapi")
+pytest.importorskip("gradio")
+
+import groww_gradio  # noqa: E402
+
+
+def test_prune_nulls_drops_none():
+    value = {"a": 1, "b": None, "c": [1, None, {"d": None, "e": 2}]}
+    assert groww_gradio._prune_nulls(value) == {"a": 1, "c": [1, {"e": 2}]}
+    assert value["b"] is None  # input left untouched
+
+
+def test_prune_nulls_reuses_clean_containers():
+    clean = {"x": [1, 2], "y": {"z": 3}}
+    value = {"clean": clean, "gone": None}
+    pruned = groww_gradio._prune_nulls(value)
+    assert pruned == {"clean": clean}
+    assert pruned["clean"] is clean
+    assert groww_gradio._prune_nulls(clean) is clean
+
+
+def test_backtest_stats():
+    stats = groww_gradio._backtest_stats(np.array([10.0, 11.0, 9.0, 12.0]))
+    assert stats["count"] == 4
+    assert stats["return_pct"] == pytest.approx(20.0)
+    assert stats["max_drawdown_pct"] == pytest.approx(-100.0 * 2 / 11)
+    assert stats["sharpe_per_bar"] is not None
+
+
+def test_backtest_stats_zero_closes_stay_finite():
+    stats = groww_gradio._backtest_stats(np.array([0.0, 10.0, 0.0, 12.0, 11.0]))
+    assert stats["return_pct"] is None
+    for key in ("max_drawdown_pct", "volatility_pct", "sharpe_per_bar"):
+        assert np.isfinite(stats[key])
+
+
+class _Feed:
+    def __init__(self, fail=(), hang=None):
+        self.calls = []
+        self.fail = set(fail)
+        self.hang = hang
+
+    def subscribe_ltp(self, instruments):
+        self.calls.append([i["exchange_token"] for i in instruments])
+        if self.hang is not None:
+            self.hang.wait()
+        if self.fail & {i["exchange_token"] for i in instruments}:
+            raise ValueError("bad instrument")
+        resp = {}
+        for i in instruments:
+            resp.setdefault(i["exchange"], {}).setdefault(i["segment"], {})[
+                i["exchange_token"]
+            ] = True
+        return resp
+
+
+def _instrument(exchange_token):
+    return {"exchange": "NSE", "segment": "CASH", "exchange_token": exchange_token}
+
+
+def _queue(feed, monkeypatch, tokens):
+    monkeypatch.setattr(groww_gradio, "_get_feed", lambda token: feed)
+    return groww_gradio._queue_subscriptions(
+        "tok", [("subscribe_ltp", _instrument(t)) for t in tokens]
+    )
+
+
+def test_subscriptions_batch_and_split_results(monkeypatch):
+    feed = _Feed()
+    waiters = _queue(feed, monkeypatch, ["1", "2"])
+    results = [groww_gradio._subscription_result(w) for w in waiters]
+    assert feed.calls == [["1", "2"]]
+    assert results == [{"NSE": {"CASH": {"1": True}}}, {"NSE": {"CASH": {"2": True}}}]
+
+
+def test_subscriptions_bad_instrument_fails_alone(monkeypatch):
+    feed = _Feed(fail={"BAD"})
+    good, bad = _queue(feed, monkeypatch, ["1", "BAD"])
+    assert groww_gradio._subscription_result(good) == {"NSE": {"CASH": {"1": True}}}
+    with pytest.raises(ValueError):
+        groww_gradio._subscription_result(bad)
+
+
+def test_subscriptions_missing_keys_rejected(monkeypatch):
+    (waiter,) = _queue(_Feed(), monkeypatch, [""])
+    with pytest.raises(ValueError, match="exchange_token"):
+        waiter.result(timeout=1)
+
+
+def test_subscription_wait_times_out(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    monkeypatch.setattr(groww_gradio, "SUBSCRIBE_TIMEOUT", 0.2)
+    (waiter,) = _queue(_Feed(hang=release), monkeypatch, ["1"])
+    try:
+        with pytest.raises(TimeoutError):
+            groww_gradio._subscription_result(waiter)
+    finally:
+        release.set()
@@ -0,0 +1,56 @@
+import datetime as dt
+import os
+
+import _secrets_cache
+
+
+def _load(path):
+    _secrets_cache._load_toml_cached.cache_clear()
+    return _secrets_cache.load_toml(path)
+
+
+def test_missing_file_is_empty(tmp_path):
+    assert _load(tmp_path / "missing.toml") == {}
+
+
+def test_sidecar_written_and_reused(tmp_path):
+    path = tmp_path / "s.toml"
+    path.write_text('api_key = "abc"\nport = 3\n')
+    assert _load(path) == {"api_key": "abc", "port": 3}
+    sidecar = tmp_path / "s.toml.cache.json"
+    assert sidecar.exists()
+    assert sidecar.stat().st_mode & 0o777 == 0o600
+    # A warm load comes from the sidecar and returns the same values.
+    assert _load(path) == {"api_key": "abc", "port": 3}
+
+
+def test_sidecar_invalidated_on_change(tmp_path):
+    path = tmp_path / "s.toml"
+    path.write_text('api_key = "abc"\n')
+    _load(path)
+    st = path.stat()
+    path.write_text('api_key = "xyz1"\n')
+    # Same mtime, different size.
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert _load(path) == {"api_key": "xyz1"}
+    path.write_text('api_key = "abcd"\n')
+    # Same size, different mtime.
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _load(path) == {"api_key": "abcd"}
+
+
+def test_datetimes_skip_sidecar(tmp_path):
+    path = tmp_path / "s.toml"
+    path.write_text("when = 2024-01-01T10:00:00\n")
+    cold = _load(path)
+    warm = _load(path)
+    assert cold == warm == {"when": dt.datetime(2024, 1, 1, 10, 0)}
+    assert not (tmp_path / "s.toml.cache.json").exists()
+
+
+def test_callers_get_their_own_copy(tmp_path):
+    path = tmp_path / "s.toml"
+    path.write_text('api_key = "abc"\n')
+    cfg = _secrets_cache.load_toml(path)
+    cfg["api_key"] = "changed"
+    assert _secrets_cache.load_toml(path) == {"api_key": "abc"}